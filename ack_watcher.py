@@ -0,0 +1,88 @@
+import threading
+import time
+
+THUMBS_UP_PREFIXES = ("thumbsup", "+1", "thumbs_up")
+
+def find_thumbs_up_user(reactions):
+    """Return the first user who reacted with a thumbs up, if any"""
+    for reaction in reactions:
+        if reaction["name"].startswith(THUMBS_UP_PREFIXES):
+            users = reaction.get("users", [])
+            if users:
+                return users[0]
+    return None
+
+class AcknowledgmentWatcher:
+    """Watch every alert posted in a run for a thumbs up on one shared polling schedule.
+
+    Alerts are registered with watch() as they are posted and polled from a single
+    background thread, so posting and ticket creation never wait on reactions.
+    wait() blocks once at the end of the run until each alert is acknowledged or
+    its own watch window has expired.
+    """
+
+    def __init__(self, get_reactions, on_acknowledged, timeout=60, interval=5):
+        self.get_reactions = get_reactions
+        self.on_acknowledged = on_acknowledged
+        self.timeout = timeout
+        self.interval = interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._thread = None
+
+    def watch(self, ts, ticket_key):
+        """Start watching a posted alert for acknowledgment"""
+        with self._lock:
+            self._pending[ts] = (ticket_key, time.time() + self.timeout)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ack-watcher", daemon=True)
+                self._thread.start()
+        print(f"👀 Watching alert for {ticket_key} for thumbs up (timeout: {self.timeout}s)")
+
+    def wait(self):
+        """Block until every watched alert is acknowledged or timed out"""
+        with self._lock:
+            thread = self._thread
+            outstanding = len(self._pending)
+        if thread is None:
+            return
+        if outstanding:
+            print(f"⏳ Waiting for acknowledgments on {outstanding} alert{'s' if outstanding != 1 else ''}...")
+        self._closing.set()
+        thread.join()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                pending = list(self._pending.items())
+            if not pending:
+                if self._closing.is_set():
+                    break
+                self._closing.wait(self.interval)
+                continue
+            now = time.time()
+            for ts, (ticket_key, deadline) in pending:
+                if now >= deadline:
+                    print(f"⏰ Timeout reached - no thumbs up detected for {ticket_key} within {self.timeout} seconds")
+                    self._forget(ts)
+                    continue
+                try:
+                    user_id = find_thumbs_up_user(self.get_reactions(ts))
+                except Exception as e:
+                    print(f"❌ Error checking reactions for {ticket_key}: {str(e)}")
+                    continue
+                if user_id:
+                    self._forget(ts)
+                    try:
+                        self.on_acknowledged(ts, ticket_key, user_id)
+                    except Exception as e:
+                        print(f"❌ Error processing acknowledgment for {ticket_key}: {str(e)}")
+            with self._lock:
+                if not self._pending and self._closing.is_set():
+                    break
+            time.sleep(self.interval)
+
+    def _forget(self, ts):
+        with self._lock:
+            self._pending.pop(ts, None)
@@ -0,0 +1,190 @@
+import argparse
+import functools
+import glob
+import gzip
+import importlib.util
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree.ElementTree import ParseError
+
+from feed_sources import OUTPUT_DIR, SOURCES, source_for_file
+from feed_stream import iter_entries
+from keyword_matcher import KeywordMatcher, is_alert, strip_html_tags
+from seen_store import entry_key
+from snapshot_store import SNAPSHOT_DIR, SnapshotStore
+import keywords
+
+# Entries handed to a worker process at a time
+CHUNK_SIZE = 500
+
+# Matchers built once per worker process by init_worker()
+_matchers = {}
+
+def keyword_categories(module):
+    """{category: keywords} from a keywords.py-style module"""
+    return {
+        "products": list(module.PRODUCT_KEYWORDS),
+        "threats": list(module.THREAT_KEYWORDS),
+        "others": list(module.OTHER_KEYWORDS),
+    }
+
+def load_keyword_file(path):
+    """Import a keywords.py-style file defining PRODUCT/THREAT/OTHER_KEYWORDS"""
+    spec = importlib.util.spec_from_file_location("candidate_keywords", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return keyword_categories(module)
+
+def apply_edits(categories, add, remove):
+    """Copy of categories with "category:keyword" additions and removals applied"""
+    edited = {name: list(words) for name, words in categories.items()}
+    for spec in add:
+        name, _, word = spec.partition(":")
+        if name not in edited or not word:
+            raise ValueError(f"expected <{'|'.join(edited)}>:<keyword>, got {spec!r}")
+        if word not in edited[name]:
+            edited[name].append(word)
+    for spec in remove:
+        name, _, word = spec.partition(":")
+        if name not in edited or word not in edited[name]:
+            raise ValueError(f"{spec!r} is not a current keyword")
+        edited[name].remove(word)
+    return edited
+
+def read_entries(path):
+    """Parse every entry of an RSS/Atom file, un-gzipping *.gz files"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        return list(iter_entries(f))
+
+def read_snapshot(snapshots, sha256):
+    """Parse every entry of a raw feed body kept in the snapshot store"""
+    with snapshots.open(sha256) as f:
+        return list(iter_entries(f))
+
+def collect_entries(paths, snapshots=None):
+    """[(source, title, description)] for every distinct entry in the files and stored snapshots, plus documents read"""
+    documents = []
+    for path in paths:
+        name = source_for_file(path)
+        if name is None:
+            print(f"⚠️ Skipping {path}: no source matches its file name")
+            continue
+        documents.append((name, path, functools.partial(read_entries, path)))
+    if snapshots is not None:
+        for name, sha256 in snapshots.snapshots():
+            if name in SOURCES:
+                documents.append((name, f"snapshot {sha256[:12]}", functools.partial(read_snapshot, snapshots, sha256)))
+
+    seen = set()
+    entries = []
+    read = 0
+    for name, label, read_document in documents:
+        try:
+            parsed = read_document()
+        except (OSError, ParseError) as e:
+            print(f"⚠️ Skipping {label}: {e}")
+            continue
+        read += 1
+        exclude = SOURCES[name].get("exclude")
+        for entry in parsed:
+            key = (name, entry_key(entry) or str(getattr(entry, 'title', '')))
+            if key in seen or (exclude and exclude(entry)):
+                continue
+            seen.add(key)
+            entries.append((name, str(getattr(entry, 'title', '')), str(getattr(entry, 'description', ''))))
+    return entries, read
+
+def init_worker(baseline, candidate):
+    _matchers["baseline"] = KeywordMatcher(baseline)
+    _matchers["candidate"] = KeywordMatcher(candidate)
+
+def alert_keywords(matcher, text):
+    """Keywords behind an alert on text, or None if the alert rule is not met"""
+    hits = matcher.match_lowered(text)
+    if not is_alert(hits):
+        return None
+    return [f"{name}:{word}" for name, words in hits.items() for word in words]
+
+def replay_chunk(chunk):
+    """[(source, baseline keywords or None, candidate keywords or None)] for a chunk of entries"""
+    results = []
+    for name, title, description in chunk:
+        text = (title + ' ' + strip_html_tags(description)).lower()
+        results.append((name, alert_keywords(_matchers["baseline"], text), alert_keywords(_matchers["candidate"], text)))
+    return results
+
+def backtest(entries, baseline, candidate, workers=None):
+    """Replay entries through both keyword sets, returning per-source and per-keyword alert counts"""
+    chunks = [entries[i:i + CHUNK_SIZE] for i in range(0, len(entries), CHUNK_SIZE)]
+    per_source = {}
+    per_keyword = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(baseline, candidate)) as pool:
+        for results in pool.map(replay_chunk, chunks):
+            for name, base_hits, cand_hits in results:
+                counts = per_source.setdefault(name, Counter())
+                counts["entries"] += 1
+                for label, hits in (("baseline", base_hits), ("candidate", cand_hits)):
+                    if hits is None:
+                        continue
+                    counts[label] += 1
+                    for keyword in hits:
+                        per_keyword.setdefault(keyword, Counter())[label] += 1
+    return per_source, per_keyword
+
+def print_report(per_source, per_keyword):
+    print(f"\n{'Source':<14}{'Entries':>9}{'Baseline':>10}{'Candidate':>11}{'Diff':>7}")
+    totals = Counter()
+    for name in sorted(per_source):
+        counts = per_source[name]
+        totals.update(counts)
+        print(f"{name:<14}{counts['entries']:>9}{counts['baseline']:>10}{counts['candidate']:>11}{counts['candidate'] - counts['baseline']:>+7}")
+    print(f"{'total':<14}{totals['entries']:>9}{totals['baseline']:>10}{totals['candidate']:>11}{totals['candidate'] - totals['baseline']:>+7}")
+
+    changed = [(k, c) for k, c in per_keyword.items() if c["baseline"] != c["candidate"]]
+    print(f"\n{len(changed)} keyword{'s' if len(changed) != 1 else ''} with a different alert count:")
+    for keyword, counts in sorted(changed, key=lambda kc: -abs(kc[1]["candidate"] - kc[1]["baseline"])):
+        print(f"   • {keyword:<40}{counts['baseline']:>6} → {counts['candidate']:<6}({counts['candidate'] - counts['baseline']:+d})")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay archived feed entries through current and candidate keyword lists and compare alert volume")
+    parser.add_argument("paths", nargs="*", help="RSS/Atom files or directories to replay instead of feeds/*.xml")
+    parser.add_argument("--no-feeds", dest="feeds", action="store_false", help="Do not replay feeds/*.xml")
+    parser.add_argument("--candidate", help="keywords.py-style file with the candidate keyword lists")
+    parser.add_argument("--add", action="append", default=[], metavar="CATEGORY:KEYWORD", help="Add a keyword to the candidate lists (products, threats or others)")
+    parser.add_argument("--remove", action="append", default=[], metavar="CATEGORY:KEYWORD", help="Remove a keyword from the candidate lists")
+    parser.add_argument("--snapshots", default=SNAPSHOT_DIR, metavar="DIR", help="Snapshot store whose raw upstream feed bodies are replayed (default .snapshots)")
+    parser.add_argument("--no-snapshots", dest="snapshots", action="store_const", const=None, help="Do not replay stored snapshots")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--json", dest="json_path", help="Also write the counts to this JSON file")
+    args = parser.parse_args(argv)
+    if not args.paths and not args.feeds and args.snapshots is None:
+        parser.error("nothing to replay: pass feed files or drop --no-feeds/--no-snapshots")
+
+    baseline = keyword_categories(keywords)
+    try:
+        candidate = apply_edits(load_keyword_file(args.candidate) if args.candidate else baseline, args.add, args.remove)
+    except ValueError as e:
+        parser.error(str(e))
+
+    paths = []
+    for path in args.paths or ([OUTPUT_DIR] if args.feeds else []):
+        if os.path.isdir(path):
+            paths.extend(sorted(glob.glob(os.path.join(path, "*.xml")) + glob.glob(os.path.join(path, "*.xml.gz"))))
+        else:
+            paths.append(path)
+
+    entries, read = collect_entries(paths, SnapshotStore(args.snapshots) if args.snapshots else None)
+    print(f"📚 Replaying {len(entries)} entries from {read} document{'s' if read != 1 else ''}")
+    per_source, per_keyword = backtest(entries, baseline, candidate, args.workers)
+    print_report(per_source, per_keyword)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"sources": per_source, "keywords": per_keyword}, f, indent=2)
+        print(f"💾 Wrote counts to {args.json_path}")
+
+if __name__ == "__main__":
+    main()
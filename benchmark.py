@@ -0,0 +1,328 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Every store, cache and output file the benchmark touches lives in a scratch
+# directory. This must be set before the modules below are imported, since
+# they resolve their default paths at import time.
+SCRATCH_DIR = tempfile.mkdtemp(prefix="feed-benchmark-")
+os.environ["FEED_DATA_DIR"] = SCRATCH_DIR
+atexit.register(shutil.rmtree, SCRATCH_DIR, ignore_errors=True)
+
+import argparse
+import contextlib
+import email.utils
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import threading
+import time
+from xml.sax.saxutils import escape
+
+import feedparser
+
+from dedup_index import DedupIndex
+from entry_index import EntryIndex
+from feed_archive import FeedArchive
+from feed_stream import iter_entries
+from feed_writer import render_item, write_feed
+from keyword_matcher import KeywordMatcher, is_alert, match_entry, strip_html_tags
+from rate_limiter import JIRA_RATE_LIMITER, SLACK_RATE_LIMITER
+from replay import REPLAY_PROJECT, FakeServices
+from seen_store import SeenStore, entry_key
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SYLLABLES = ("ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "zen", "qua", "tor", "pex", "dyn", "ix", "ul", "bri")
+
+# Filler vocabulary for titles and descriptions; never contains a generated keyword
+FILLER = (
+    "the", "a", "new", "report", "update", "team", "users", "release", "version", "support", "customers",
+    "announced", "today", "after", "week", "service", "security", "network", "data", "cloud", "systems",
+    "company", "research", "attackers", "analysis", "platform", "software", "hardware", "devices", "patch",
+)
+
+# Stages in pipeline order, with what each one times
+STAGES = {
+    "parse_feedparser": "feedparser.parse of the whole document",
+    "parse_stream": "feed_stream.iter_entries (iterparse) over the document",
+    "build_matcher": "compiling the keyword lists into the Aho-Corasick matcher",
+    "strip_html": "strip_html_tags on every description",
+    "match": "match_entry + is_alert on every entry",
+    "seen_lookup": "SeenStore membership checks for every matched entry",
+    "seen_add": "SeenStore.add (one commit each) for every alert",
+    "entry_index": "EntryIndex.add for every entry, one flush",
+    "archive": "FeedArchive.add/prune/items for the matched entries",
+    "render_items": "feed_writer.render_item (ElementTree) for every matched entry",
+    "write_feed": "feed_writer.write_feed of the rendered items",
+    "dedup": "DedupIndex signature/find/add for every alert",
+    "check_acknowledgments": "check_acknowledgments.check_message_acknowledgments over the posted alerts",
+}
+
+def make_word(rng, syllables):
+    return "".join(rng.choice(SYLLABLES) for _ in range(syllables))
+
+def make_keywords(count, seed=0):
+    """{category: keywords} of `count` distinct synthetic keywords: half products, a quarter each threats/others"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        word = make_word(rng, rng.randint(3, 5))
+        if rng.random() < 0.2:
+            word += " " + make_word(rng, 2)
+        words.add(word)
+    words = sorted(words)
+    rng.shuffle(words)
+    products, threats = count // 2, count // 4
+    return {
+        "products": words[:products],
+        "threats": words[products:products + threats],
+        "others": words[products + threats:],
+    }
+
+def make_description(rng, size, inserted=()):
+    """HTML paragraphs of roughly `size` characters with the inserted keywords scattered through them"""
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    for keyword in inserted:
+        words.insert(rng.randrange(len(words) + 1), keyword)
+    html = []
+    for start in range(0, len(words), 40):
+        chunk = " ".join(words[start:start + 40])
+        html.append(f'<p>{chunk} <a href="https://example.com/{start}">more</a></p>')
+    return "".join(html)
+
+def make_feed(entries, description_size, keywords, match_rate=0.05, seed=0):
+    """RSS 2.0 document bytes with `entries` items, newest first.
+
+    About match_rate of the items mention a product and a threat keyword,
+    which is an alert; the rest only mention filler words.
+    """
+    rng = random.Random(seed)
+    now = time.time()
+    items = []
+    for i in range(entries):
+        inserted = []
+        if rng.random() < match_rate:
+            inserted = [rng.choice(keywords["products"]), rng.choice(keywords["threats"])]
+        title = " ".join(rng.choice(FILLER) for _ in range(8)) + f" {i}"
+        description = make_description(rng, description_size, inserted)
+        items.append(
+            f"<item><title>{escape(title)}</title><link>https://example.com/entries/{i}</link>"
+            f"<guid>https://example.com/entries/{i}</guid><description><![CDATA[{description}]]></description>"
+            f"<pubDate>{email.utils.formatdate(now - i * 60, usegmt=True)}</pubDate></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>Benchmark</title>'
+        "<link>https://example.com/</link><description>Synthetic benchmark feed</description>"
+        + "".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+class Stages:
+    """Runs and times the selected stages, keeping each stage's output for the next"""
+
+    def __init__(self, selected, repeat):
+        self.selected = selected
+        self.repeat = repeat
+        self.results = {}
+
+    def run(self, name, items, func, needed=False):
+        """Time func (best of repeat runs) if the stage is selected.
+
+        An unselected stage is skipped, or run once untimed when a later
+        stage needs its output.
+        """
+        if name not in self.selected:
+            return func() if needed else None
+        runs = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            value = func()
+            runs.append(time.perf_counter() - start)
+        best = min(runs)
+        self.results[name] = {
+            "seconds": round(best, 6),
+            "mean_seconds": round(statistics.mean(runs), 6),
+            "items": items,
+            "per_item_us": round(best / items * 1e6, 3) if items else None,
+        }
+        per_item = f"{best / items * 1e6:>10.1f} µs/item" if items else ""
+        print(f"⏱️ {name:<23}{best:>9.3f}s {items:>9} items{per_item}")
+        return value
+
+def scratch_path(name):
+    """Fresh path under the scratch directory, so every timed run starts from an empty store"""
+    return tempfile.mkstemp(prefix=f"{name}-", dir=SCRATCH_DIR)[1]
+
+def seen_lookup(entries):
+    store = SeenStore(scratch_path("seen"))
+    found = sum(1 for entry in entries if entry_key(entry) in store)
+    store.close()
+    return found
+
+def seen_add(items):
+    store = SeenStore(scratch_path("seen"))
+    for entry in items:
+        store.add(entry_key(entry), "benchmark")
+    store.close()
+
+def index_entries(entries):
+    index = EntryIndex(scratch_path("entries"))
+    for entry in entries:
+        index.add("benchmark", entry, strip_html_tags(getattr(entry, 'description', '')))
+    index.flush()
+    index.close()
+
+def archive_entries(entries):
+    archive = FeedArchive(scratch_path("archive"))
+    archive.add("benchmark", entries)
+    archive.prune("benchmark")
+    items = list(archive.items("benchmark"))
+    archive.close()
+    return items
+
+def dedup_alerts(entries):
+    index = DedupIndex(scratch_path("dedup"))
+    for i, entry in enumerate(entries):
+        # Spread the alerts over several sources, since entries only fold into other sources' stories
+        source = f"benchmark-{i % 5}"
+        title = str(getattr(entry, 'title', ''))
+        signature = DedupIndex.signature(title)
+        if index.find(signature, [], source) is None:
+            index.add(source, entry_key(entry), title, signature, [])
+    index.close()
+
+def post_alerts(server, count):
+    """Post `count` alerts to the stand-in the way post_to_slack formats their ticket links"""
+    for i in range(count):
+        key = f"{REPLAY_PROJECT}-{i + 1}"
+        server.post_message({"text": f"🛡️ Benchmark alert {i}\nJIRA Ticket: <{server.url}/browse/{key}|{key}>"})
+
+def check_acknowledgments(server):
+    # check_acknowledgments reads its Slack/JIRA settings at import, so point them at the stand-in first
+    os.environ.update({
+        "SLACK_API_URL": f"{server.url}/api",
+        "SLACK_BOT_TOKEN": "xoxb-benchmark",
+        "SLACK_CHANNEL_ID": "C0BENCH",
+        "JIRA_URL": server.url,
+        "JIRA_EMAIL": "benchmark@example.com",
+        "JIRA_API_TOKEN": "benchmark",
+    })
+    import check_acknowledgments as module
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.check_message_acknowledgments()
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} ({baseline.get('commit') or 'unknown commit'}):")
+    print(f"{'Stage':<25}{'Before':>10}{'After':>10}{'Change':>9}")
+    for name, stage in results["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if not before:
+            continue
+        change = (stage["seconds"] - before["seconds"]) / before["seconds"] * 100 if before["seconds"] else 0.0
+        print(f"{name:<25}{before['seconds']:>9.3f}s{stage['seconds']:>9.3f}s{change:>+8.1f}%")
+    if baseline.get("params") != results["params"]:
+        print("⚠️ The runs used different parameters - compare per-item times")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time each stage of the feed filter pipeline on synthetic feeds",
+        epilog="stages:\n" + "\n".join(f"  {name:<23}{what}" for name, what in STAGES.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--entries", type=int, default=100_000, help="Entries in the synthetic feed (default 100000)")
+    parser.add_argument("--keywords", type=int, default=5_000, help="Keywords across all categories (default 5000)")
+    parser.add_argument("--description-size", type=int, default=500, metavar="CHARS", help="Approximate description length (default 500)")
+    parser.add_argument("--match-rate", type=float, default=0.05, help="Fraction of entries that are alerts (default 0.05)")
+    parser.add_argument("--alerts", type=int, default=200, help="Alerts recorded by the seen_add and dedup stages (default 200)")
+    parser.add_argument("--messages", type=int, default=500, help="Posted alerts scanned by check_acknowledgments (default 500)")
+    parser.add_argument("--ack-rate", type=float, default=0.5, help="Fraction of those alerts with a thumbs up (default 0.5)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; the fastest is reported (default 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic keywords and feed")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES), metavar="STAGE", help=f"Stages to time (default all: {', '.join(STAGES)})")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    parser.add_argument("--compare", metavar="JSON", help="Compare against the results of an earlier run")
+    args = parser.parse_args(argv)
+
+    print(f"🧪 Generating {args.entries} entries (~{args.description_size} char descriptions) and {args.keywords} keywords...")
+    start = time.perf_counter()
+    keywords = make_keywords(args.keywords, args.seed)
+    body = make_feed(args.entries, args.description_size, keywords, args.match_rate, args.seed)
+    print(f"   • {len(body) / 1024 / 1024:.1f} MB feed generated in {time.perf_counter() - start:.1f}s\n")
+
+    stages = Stages(set(args.stages), args.repeat)
+    parsed = stages.run("parse_feedparser", args.entries, lambda: feedparser.parse(body))
+    entries = parsed.entries if parsed is not None else list(iter_entries(io.BytesIO(body)))
+    stages.run("parse_stream", args.entries, lambda: sum(1 for _ in iter_entries(io.BytesIO(body))))
+    matcher = stages.run("build_matcher", args.keywords, lambda: KeywordMatcher(keywords), needed=True)
+    stages.run("strip_html", len(entries), lambda: [strip_html_tags(getattr(e, 'description', '')) for e in entries])
+    matched = stages.run("match", len(entries), lambda: [e for e in entries if is_alert(match_entry(e, matcher))], needed=True)
+    alerts = matched[:args.alerts]
+    stages.run("seen_lookup", len(matched), lambda: seen_lookup(matched))
+    stages.run("seen_add", len(alerts), lambda: seen_add(alerts))
+    stages.run("entry_index", len(entries), lambda: index_entries(entries))
+    stages.run("archive", len(matched), lambda: archive_entries(matched))
+    rendered = stages.run("render_items", len(matched), lambda: [render_item(e) for e in matched], needed="write_feed" in stages.selected)
+    channel = ("Benchmark", "https://example.com/", "Synthetic benchmark feed")
+    output_path = os.path.join(SCRATCH_DIR, "benchmark-products.xml")
+    stages.run("write_feed", len(matched), lambda: write_feed(output_path, channel, rendered, str(time.perf_counter())))
+    stages.run("dedup", len(alerts), lambda: dedup_alerts(alerts))
+
+    if "check_acknowledgments" in stages.selected:
+        # Measure the scripts' own work, not the token buckets sized for the real APIs.
+        # Runs once whatever --repeat says: a second pass would find its threads already acknowledged.
+        SLACK_RATE_LIMITER.scale = JIRA_RATE_LIMITER.scale = 0
+        server = FakeServices({}, ack_rate=args.ack_rate, seed=args.seed)
+        threading.Thread(target=server.serve_forever, name="benchmark-server", daemon=True).start()
+        post_alerts(server, args.messages)
+        stages.repeat = 1
+        stages.run("check_acknowledgments", args.messages, lambda: check_acknowledgments(server))
+        server.shutdown()
+        server.server_close()
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "entries": args.entries,
+            "keywords": args.keywords,
+            "description_size": args.description_size,
+            "match_rate": args.match_rate,
+            "alerts": args.alerts,
+            "messages": args.messages,
+            "ack_rate": args.ack_rate,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "matched": len(matched),
+        "stages": stages.results,
+    }
+    total = sum(stage["seconds"] for stage in stages.results.values())
+    print(f"\n🏁 {len(stages.results)} stages took {total:.2f}s ({len(matched)} of {len(entries)} entries matched)")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Wrote results to {args.json_path}")
+    if args.compare:
+        print_comparison(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 import os
 import json
-import requests
-import base64
 from datetime import datetime, timedelta
 import time
+from http_client import slack_session, jira_session
+from ack_watcher import find_thumbs_up_user
+from user_cache import UserCache
+from transition_cache import TransitionCache
 
 # JIRA Configuration
 JIRA_URL = os.environ.get("JIRA_URL")
@@ -11,97 +13,134 @@ JIRA_EMAIL = os.environ.get("JIRA_EMAIL")
 JIRA_API_TOKEN = os.environ.get("JIRA_API_TOKEN")
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 SLACK_CHANNEL_ID = os.environ.get("SLACK_CHANNEL_ID")
+SLACK_API_URL = os.environ.get("SLACK_API_URL", "https://slack.com/api")
+
+# One pooled keep-alive session per API host, shared by every helper below
+slack_http = slack_session(SLACK_BOT_TOKEN)
+jira_http = jira_session(JIRA_EMAIL, JIRA_API_TOKEN)
+
+# Slack user -> email -> JIRA accountId lookups shared across runs
+user_cache = UserCache()
+
+# "In Progress" transition IDs resolved per project and issue type
+transition_cache = TransitionCache()
 
 # File to store message timestamps and ticket mappings
-MAPPING_FILE = os.path.join(os.path.dirname(__file__), ".message_ticket_mappings.json")
+MAPPING_FILE = os.path.join(os.environ.get("FEED_DATA_DIR") or os.path.dirname(os.path.abspath(__file__)), ".message_ticket_mappings.json")
 
-def load_message_mappings():
-    """Load existing message to ticket mappings"""
+# How far back the first run (with no saved watermark) looks for alerts
+INITIAL_LOOKBACK_HOURS = 24
+
+def load_message_state():
+    """Load the history watermark and message to ticket mappings"""
     if os.path.exists(MAPPING_FILE):
         with open(MAPPING_FILE, "r") as f:
-            return json.load(f)
-    return {}
+            state = json.load(f)
+        if "mappings" in state:
+            return state
+        # Older files hold just the flat mappings dict
+        return {"watermark": None, "mappings": state}
+    return {"watermark": None, "mappings": {}}
 
-def save_message_mappings(mappings):
-    """Save message to ticket mappings"""
+def save_message_state(state):
+    """Save the history watermark and message to ticket mappings"""
     with open(MAPPING_FILE, "w") as f:
-        json.dump(mappings, f)
+        json.dump(state, f)
 
-def clear_old_mappings():
-    """Clear mappings older than 24 hours to prevent file bloat"""
-    if os.path.exists(MAPPING_FILE):
-        with open(MAPPING_FILE, "r") as f:
-            mappings = json.load(f)
-        
-        cutoff_time = datetime.now() - timedelta(hours=24)
-        filtered_mappings = {}
-        
-        for ts, data in mappings.items():
-            if "acknowledged_at" in data:
-                acknowledged_time = datetime.fromisoformat(data["acknowledged_at"])
-                if acknowledged_time > cutoff_time:
-                    filtered_mappings[ts] = data
-            elif "checked_at" in data:
-                checked_time = datetime.fromisoformat(data["checked_at"])
-                if checked_time > cutoff_time:
-                    filtered_mappings[ts] = data
-        
-        with open(MAPPING_FILE, "w") as f:
-            json.dump(filtered_mappings, f)
-        print(f"🧹 Cleared old mappings, kept {len(filtered_mappings)} recent entries")
+def clear_old_mappings(mappings):
+    """Drop mappings older than 24 hours to prevent file bloat"""
+    cutoff_time = datetime.now() - timedelta(hours=24)
+    filtered_mappings = {}
+    
+    for ts, data in mappings.items():
+        if "acknowledged_at" in data:
+            acknowledged_time = datetime.fromisoformat(data["acknowledged_at"])
+            if acknowledged_time > cutoff_time:
+                filtered_mappings[ts] = data
+        elif "checked_at" in data:
+            checked_time = datetime.fromisoformat(data["checked_at"])
+            if checked_time > cutoff_time:
+                filtered_mappings[ts] = data
+    
+    print(f"🧹 Cleared old mappings, kept {len(filtered_mappings)} recent entries")
+    return filtered_mappings
+
+def get_messages_since(oldest):
+    """Page through channel history from `oldest` onward.
 
-def get_recent_messages():
-    """Get recent messages from Slack channel"""
-    url = "https://slack.com/api/conversations.history"
+    Returns (messages, complete); complete is False when a page failed, in
+    which case the watermark must not be advanced.
+    """
+    url = f"{SLACK_API_URL}/conversations.history"
     params = {
         "channel": SLACK_CHANNEL_ID,
-        "limit": 100  # Get last 100 messages instead of 50
+        "oldest": oldest,
+        "inclusive": "true",
+        "limit": 200
     }
-    headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}
+    messages = []
+    pages = 0
     
-    print(f"🔍 Fetching recent messages from Slack...")
-    resp = requests.get(url, headers=headers, params=params)
-    
-    if resp.status_code == 200:
-        response_data = resp.json()
+    print(f"🔍 Fetching messages from Slack since {oldest}...")
+    while True:
+        resp = slack_http.get(url, params=params)
+        if resp.status_code != 200:
+            print(f"❌ Failed to get messages: {resp.status_code}")
+            return messages, False
         
+        response_data = resp.json()
         if not response_data.get("ok"):
             print(f"❌ Slack API error: {response_data.get('error', 'unknown error')}")
-            return []
+            return messages, False
         
-        messages = response_data.get("messages", [])
-        print(f"✅ Retrieved {len(messages)} messages")
-        return messages
-    else:
-        print(f"❌ Failed to get messages: {resp.status_code}")
-        return []
+        pages += 1
+        messages.extend(response_data.get("messages", []))
+        cursor = response_data.get("response_metadata", {}).get("next_cursor")
+        if not response_data.get("has_more") or not cursor:
+            break
+        params["cursor"] = cursor
+    
+    print(f"✅ Retrieved {len(messages)} messages in {pages} page{'s' if pages != 1 else ''}")
+    return messages, True
 
-def get_reactions(ts):
-    """Get reactions for a specific message"""
-    url = "https://slack.com/api/reactions.get"
+def get_message(ts):
+    """Fetch the single channel message posted at `ts`, or None if it is gone or the call failed"""
+    url = f"{SLACK_API_URL}/conversations.history"
     params = {
         "channel": SLACK_CHANNEL_ID,
-        "timestamp": ts
+        "latest": ts,
+        "oldest": ts,
+        "inclusive": "true",
+        "limit": 1
     }
-    resp = requests.get(url, headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}, params=params)
-    return resp.json().get("message", {}).get("reactions", [])
+    resp = slack_http.get(url, params=params)
+    if resp.status_code != 200:
+        print(f"❌ Failed to get message {ts}: {resp.status_code}")
+        return None
+    
+    response_data = resp.json()
+    if not response_data.get("ok"):
+        print(f"❌ Slack API error for message {ts}: {response_data.get('error', 'unknown error')}")
+        return None
+    
+    messages = response_data.get("messages", [])
+    if messages and messages[0].get("ts") == ts:
+        return messages[0]
+    return None
 
 def get_user_info(user_id):
     """Get user information from Slack"""
-    url = "https://slack.com/api/users.info"
+    url = f"{SLACK_API_URL}/users.info"
     params = {"user": user_id}
-    resp = requests.get(url, headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}, params=params)
+    resp = slack_http.get(url, params=params)
     return resp.json().get("user", {})
 
 def get_jira_account_id(email):
     """Get JIRA account ID for email"""
     url = f"{JIRA_URL}/rest/api/3/user/search"
     params = {"query": email}
-    headers = {
-        "Authorization": f"Basic {base64.b64encode(f'{JIRA_EMAIL}:{JIRA_API_TOKEN}'.encode()).decode()}",
-        "Accept": "application/json"
-    }
-    resp = requests.get(url, headers=headers, params=params)
+    resp = jira_http.get(url, params=params)
+    resp.raise_for_status()
     users = resp.json()
     if users and isinstance(users, list):
         return users[0].get("accountId")
@@ -111,17 +150,12 @@ def set_triage_started_field(ticket_key):
     """Set the triage started timestamp field in JIRA"""
     field_id = "customfield_10684"
     now_iso = datetime.now().isoformat()
-    headers = {
-        "Authorization": f"Basic {base64.b64encode(f'{JIRA_EMAIL}:{JIRA_API_TOKEN}'.encode()).decode()}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
     data = {
         "fields": {
             field_id: now_iso
         }
     }
-    resp = requests.put(f"{JIRA_URL}/rest/api/3/issue/{ticket_key}", headers=headers, json=data)
+    resp = jira_http.put(f"{JIRA_URL}/rest/api/3/issue/{ticket_key}", json=data)
     if resp.status_code == 204:
         print(f"✅ Set triage started timestamp for {ticket_key}")
     else:
@@ -129,18 +163,13 @@ def set_triage_started_field(ticket_key):
 
 def assign_jira_ticket(ticket_key, slack_email, slack_username):
     """Assign JIRA ticket to user"""
-    account_id = get_jira_account_id(slack_email) if slack_email else None
+    account_id = user_cache.jira_account_id(slack_email, get_jira_account_id) if slack_email else None
     if not account_id:
         print(f"❌ Could not find JIRA accountId for {slack_email or slack_username}")
         return False
     
-    headers = {
-        "Authorization": f"Basic {base64.b64encode(f'{JIRA_EMAIL}:{JIRA_API_TOKEN}'.encode()).decode()}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
     data = {"accountId": account_id}
-    resp = requests.put(f"{JIRA_URL}/rest/api/3/issue/{ticket_key}/assignee", headers=headers, json=data)
+    resp = jira_http.put(f"{JIRA_URL}/rest/api/3/issue/{ticket_key}/assignee", json=data)
     if resp.status_code == 204:
         print(f"✅ Assigned JIRA ticket {ticket_key} to accountId {account_id}")
         return True
@@ -148,27 +177,40 @@ def assign_jira_ticket(ticket_key, slack_email, slack_username):
         print(f"❌ Failed to assign JIRA ticket: {resp.text}")
         return False
 
+def resolve_transition_id(url, transition_name):
+    """Look up a transition ID by name from the ticket's available transitions"""
+    resp = jira_http.get(url)
+    transitions = resp.json().get("transitions", [])
+    for t in transitions:
+        if t["name"].lower() == transition_name:
+            return t["id"]
+    return None
+
 def transition_jira_ticket_in_progress(ticket_key):
     """Transition JIRA ticket to In Progress"""
     url = f"{JIRA_URL}/rest/api/3/issue/{ticket_key}/transitions"
-    headers = {
-        "Authorization": f"Basic {base64.b64encode(f'{JIRA_EMAIL}:{JIRA_API_TOKEN}'.encode()).decode()}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-    resp = requests.get(url, headers=headers)
-    transitions = resp.json().get("transitions", [])
-    in_progress_id = None
-    for t in transitions:
-        if t["name"].lower() == "in progress":
-            in_progress_id = t["id"]
-            break
-    if not in_progress_id:
-        print("❌ Could not find 'In Progress' transition for this ticket.")
-        return False
+    cache_key = TransitionCache.key(ticket_key, "in progress")
+    in_progress_id = transition_cache.get(cache_key)
+    from_cache = in_progress_id is not None
+    while True:
+        if not in_progress_id:
+            in_progress_id = resolve_transition_id(url, "in progress")
+            if not in_progress_id:
+                print("❌ Could not find 'In Progress' transition for this ticket.")
+                return False
+            transition_cache.put(cache_key, in_progress_id)
+        
+        data = {"transition": {"id": in_progress_id}}
+        resp = jira_http.post(url, json=data)
+        if resp.status_code == 400 and from_cache:
+            # Workflow changed since the ID was cached: re-resolve once and retry
+            print(f"♻️ Cached 'In Progress' transition {in_progress_id} was rejected, re-resolving...")
+            transition_cache.invalidate(cache_key)
+            in_progress_id = None
+            from_cache = False
+            continue
+        break
     
-    data = {"transition": {"id": in_progress_id}}
-    resp = requests.post(url, headers=headers, json=data)
     if resp.status_code == 204:
         print(f"✅ Transitioned JIRA ticket {ticket_key} to 'In Progress'")
         return True
@@ -178,43 +220,62 @@ def transition_jira_ticket_in_progress(ticket_key):
 
 def post_thread_reply(ts, text):
     """Post reply in Slack thread"""
-    url = "https://slack.com/api/chat.postMessage"
+    url = f"{SLACK_API_URL}/chat.postMessage"
     data = {
         "channel": SLACK_CHANNEL_ID,
         "thread_ts": ts,
         "text": text
     }
-    resp = requests.post(url, headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}", "Content-Type": "application/json"}, json=data)
+    resp = slack_http.post(url, json=data)
     return resp.json()
 
 def get_thread_replies(ts):
     """Get replies in a Slack thread to check if already acknowledged"""
-    url = "https://slack.com/api/conversations.replies"
+    url = f"{SLACK_API_URL}/conversations.replies"
     params = {
         "channel": SLACK_CHANNEL_ID,
         "ts": ts
     }
-    resp = requests.get(url, headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}, params=params)
+    resp = slack_http.get(url, params=params)
     if resp.status_code == 200:
         response_data = resp.json()
         if response_data.get("ok"):
             return response_data.get("messages", [])
     return []
 
+def thread_has_acknowledgment(ts):
+    """Check whether a thread already has the bot's acknowledgment reply"""
+    for reply in get_thread_replies(ts):
+        if "Under review and acknowledged by" in reply.get("text", ""):
+            return True
+    return False
+
 def check_message_acknowledgments():
     """Main function to check for acknowledgments"""
     print("🔍 Checking for thumbs up acknowledgments...")
     
-    # Clear old mappings first
-    clear_old_mappings()
-    
-    # Load existing mappings
-    mappings = load_message_mappings()
+    # Load existing state and clear old mappings
+    state = load_message_state()
+    mappings = clear_old_mappings(state["mappings"])
     print(f"📁 Loaded {len(mappings)} existing mappings")
     
-    # Get recent messages
-    messages = get_recent_messages()
-    print(f"📋 Checking {len(messages)} recent messages")
+    # Fetch only what was posted after the watermark
+    watermark = state.get("watermark") or f"{time.time() - INITIAL_LOOKBACK_HOURS * 3600:.6f}"
+    open_alerts = {ts for ts, data in mappings.items() if not data.get("processed")}
+    print(f"📌 Watermark {watermark}, {len(open_alerts)} open alert{'s' if len(open_alerts) != 1 else ''}")
+    
+    messages, complete = get_messages_since(watermark)
+    
+    # Still-open alerts from earlier runs are re-read one message each rather than re-paging history back to them
+    fetched = {message.get("ts") for message in messages}
+    recheck = sorted((ts for ts in open_alerts if ts not in fetched), key=float)
+    if recheck:
+        print(f"🔁 Re-checking {len(recheck)} open alert{'s' if len(recheck) != 1 else ''}...")
+    for ts in recheck:
+        message = get_message(ts)
+        if message:
+            messages.append(message)
+    print(f"📋 Checking {len(messages)} messages")
     
     # Check each message for acknowledgments
     jira_messages_found = 0
@@ -227,6 +288,10 @@ def check_message_acknowledgments():
         ts = message.get("ts")
         text = message.get("text", "")
         
+        # Only new messages and still-open alerts need checking
+        if float(ts) <= float(watermark) and ts not in open_alerts:
+            continue
+        
         # Look for JIRA ticket references in the message
         if "JIRA Ticket:" in text or "JIRA ticket" in text:
             # Extract ticket key from message - handle multiple patterns
@@ -252,15 +317,11 @@ def check_message_acknowledgments():
                     skipped_count += 1
                     continue
                 
-                # Check if thread already has acknowledgment reply
-                thread_replies = get_thread_replies(ts)
-                already_acknowledged = False
-                for reply in thread_replies:
-                    if "Under review and acknowledged by" in reply.get("text", ""):
-                        already_acknowledged = True
-                        break
+                # Reactions are already included in the history payload
+                first_user = find_thumbs_up_user(message.get("reactions", []))
                 
-                if already_acknowledged:
+                # Only thumbs up candidates with replies need their thread checked for an earlier acknowledgment
+                if first_user and message.get("reply_count") and thread_has_acknowledgment(ts):
                     # Mark as processed to prevent future checks
                     mappings[ts] = {
                         "ticket_key": ticket_key,
@@ -274,38 +335,30 @@ def check_message_acknowledgments():
                 # At this point, we're checking a new message for acknowledgments
                 checked_count += 1
                 
-                # Check for thumbs up reactions
-                reactions = get_reactions(ts)
-                
-                for reaction in reactions:
-                    if reaction["name"].startswith("thumbsup") or reaction["name"].startswith("+1") or reaction["name"].startswith("thumbs_up"):
-                        users = reaction.get("users", [])
-                        if users:
-                            first_user = users[0]
-                            user_info = get_user_info(first_user)
-                            slack_username = user_info.get("name", "unknown user")
-                            slack_email = user_info.get("profile", {}).get("email", None)
-                            
-                            print(f"👍 Processing acknowledgment for {ticket_key} from {slack_username}")
-                            
-                            # Post acknowledgment
-                            post_thread_reply(ts, f"Under review and acknowledged by <@{first_user}> :white_check_mark:")
-                            
-                            # Assign ticket and transition
-                            assign_success = assign_jira_ticket(ticket_key, slack_email, slack_username)
-                            set_triage_started_field(ticket_key)
-                            transition_success = transition_jira_ticket_in_progress(ticket_key)
-                            
-                            # Mark as processed
-                            mappings[ts] = {
-                                "ticket_key": ticket_key,
-                                "processed": True,
-                                "acknowledged_by": slack_username,
-                                "acknowledged_at": datetime.now().isoformat()
-                            }
-                            
-                            new_acknowledgments += 1
-                            break
+                if first_user:
+                    user = user_cache.slack_user(first_user, get_user_info)
+                    slack_username = user["name"]
+                    slack_email = user["email"]
+                    
+                    print(f"👍 Processing acknowledgment for {ticket_key} from {slack_username}")
+                    
+                    # Post acknowledgment
+                    post_thread_reply(ts, f"Under review and acknowledged by <@{first_user}> :white_check_mark:")
+                    
+                    # Assign ticket and transition
+                    assign_success = assign_jira_ticket(ticket_key, slack_email, slack_username)
+                    set_triage_started_field(ticket_key)
+                    transition_success = transition_jira_ticket_in_progress(ticket_key)
+                    
+                    # Mark as processed
+                    mappings[ts] = {
+                        "ticket_key": ticket_key,
+                        "processed": True,
+                        "acknowledged_by": slack_username,
+                        "acknowledged_at": datetime.now().isoformat()
+                    }
+                    
+                    new_acknowledgments += 1
                 
                 # If no thumbs up found, mark as checked but not processed
                 if ts not in mappings:
@@ -319,8 +372,12 @@ def check_message_acknowledgments():
                 # Skip messages that mention JIRA but don't contain actual ticket numbers
                 pass
     
+    # Advance the watermark only when every page was fetched
+    if complete and messages:
+        watermark = max([watermark] + [m["ts"] for m in messages if m.get("ts")], key=float)
+    
     # Save updated mappings
-    save_message_mappings(mappings)
+    save_message_state({"watermark": watermark, "mappings": mappings})
     
     # Print summary
     print(f"📊 Summary:")
@@ -0,0 +1,144 @@
+import argparse
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+
+CVE_INDEX_FILE = os.path.join(os.environ.get("FEED_DATA_DIR") or os.path.dirname(os.path.abspath(__file__)), ".cve_index.db")
+
+CVE_PATTERN = re.compile(r"\bcve-\d{4}-\d{4,}\b", re.IGNORECASE)
+
+# NVD metric blocks in order of preference (API 2.0 names)
+NVD_METRIC_KEYS = ("cvssMetricV40", "cvssMetricV31", "cvssMetricV30", "cvssMetricV2")
+
+def extract_cves(text):
+    """Sorted, de-duplicated CVE IDs mentioned in text"""
+    return sorted({cve.upper() for cve in CVE_PATTERN.findall(text or '')})
+
+def load_snapshot(path):
+    """Read a JSON snapshot file, transparently un-gzipping *.gz files"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+def kev_rows(snapshot):
+    """(cve, date_added, ransomware_use) rows from a CISA KEV catalog snapshot"""
+    for vuln in snapshot.get("vulnerabilities", []):
+        if vuln.get("cveID"):
+            yield vuln["cveID"].upper(), vuln.get("dateAdded"), vuln.get("knownRansomwareCampaignUse")
+
+def nvd_score(metrics):
+    """(base score, severity) from an NVD API 2.0 metrics block, preferring the newest CVSS version"""
+    for key in NVD_METRIC_KEYS:
+        for metric in metrics.get(key, []):
+            data = metric.get("cvssData", {})
+            if data.get("baseScore") is not None:
+                return data["baseScore"], data.get("baseSeverity") or metric.get("baseSeverity")
+    return None, None
+
+def nvd_rows(snapshot):
+    """(cve, cvss, severity) rows from an NVD API 2.0 or legacy 1.1 JSON feed snapshot"""
+    for vuln in snapshot.get("vulnerabilities", []):
+        cve = vuln.get("cve", {})
+        if cve.get("id"):
+            score, severity = nvd_score(cve.get("metrics", {}))
+            yield cve["id"].upper(), score, severity
+    for item in snapshot.get("CVE_Items", []):
+        cve_id = item.get("cve", {}).get("CVE_data_meta", {}).get("ID")
+        impact = item.get("impact", {})
+        cvss = impact.get("baseMetricV3", {}).get("cvssV3") or impact.get("baseMetricV2", {}).get("cvssV2") or {}
+        if cve_id:
+            yield cve_id.upper(), cvss.get("baseScore"), cvss.get("baseSeverity") or impact.get("baseMetricV2", {}).get("severity")
+
+class CveIndex:
+    """Read-only lookups of CVSS score and CISA KEV status from a local SQLite snapshot index.
+
+    The index is built offline with build() from downloaded KEV/NVD files
+    and opened lazily on the first lookup. A missing index just means no
+    enrichment. Each lookup is one primary key query for all of an entry's CVEs.
+    """
+
+    def __init__(self, path=CVE_INDEX_FILE):
+        self.path = path
+        self.conn = None
+        self._lock = threading.Lock()
+        self._opened = False
+
+    def _connect(self):
+        if not self._opened:
+            self._opened = True
+            if os.path.exists(self.path):
+                self.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            else:
+                print(f"⚠️ No CVE index at {self.path} - CVEs will not be enriched")
+        return self.conn
+
+    def lookup(self, cves):
+        """{cve: {"cvss", "severity", "kev", "kev_date_added", "ransomware"}} for the indexed CVEs"""
+        if not cves:
+            return {}
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return {}
+            rows = conn.execute(
+                f"SELECT cve, cvss, severity, kev, kev_date_added, ransomware FROM cves WHERE cve IN ({','.join('?' * len(cves))})",
+                list(cves),
+            ).fetchall()
+        return {
+            cve: {"cvss": cvss, "severity": severity, "kev": bool(kev), "kev_date_added": date_added, "ransomware": ransomware}
+            for cve, cvss, severity, kev, date_added, ransomware in rows
+        }
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+def build(path, snapshot_files):
+    """Create or update the CVE index from KEV and NVD snapshot files, returning rows written"""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS cves (
+            cve TEXT PRIMARY KEY,
+            cvss REAL,
+            severity TEXT,
+            kev INTEGER NOT NULL DEFAULT 0,
+            kev_date_added TEXT,
+            ransomware TEXT
+        ) WITHOUT ROWID
+    """)
+    written = 0
+    for snapshot_file in snapshot_files:
+        snapshot = load_snapshot(snapshot_file)
+        if "catalogVersion" in snapshot:
+            rows = list(kev_rows(snapshot))
+            conn.executemany("""
+                INSERT INTO cves (cve, kev, kev_date_added, ransomware) VALUES (?, 1, ?, ?)
+                ON CONFLICT (cve) DO UPDATE SET kev = 1, kev_date_added = excluded.kev_date_added, ransomware = excluded.ransomware
+            """, rows)
+            print(f"📥 Loaded {len(rows)} KEV entries from {snapshot_file}")
+        else:
+            rows = list(nvd_rows(snapshot))
+            conn.executemany("""
+                INSERT INTO cves (cve, cvss, severity) VALUES (?, ?, ?)
+                ON CONFLICT (cve) DO UPDATE SET cvss = excluded.cvss, severity = excluded.severity
+            """, rows)
+            print(f"📥 Loaded {len(rows)} NVD entries from {snapshot_file}")
+        written += len(rows)
+    conn.commit()
+    conn.close()
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the offline CVE enrichment index from CISA KEV / NVD JSON snapshots")
+    parser.add_argument("snapshots", nargs="+", help="KEV catalog or NVD JSON files (optionally .gz)")
+    parser.add_argument("--db", default=CVE_INDEX_FILE, help="Index file to create or update")
+    args = parser.parse_args(argv)
+    written = build(args.db, args.snapshots)
+    print(f"🏁 Wrote {written} rows to {args.db}")
+
+if __name__ == "__main__":
+    main()
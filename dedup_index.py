@@ -0,0 +1,229 @@
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+import time
+
+DEDUP_INDEX_FILE = os.path.join(os.environ.get("FEED_DATA_DIR") or os.path.dirname(os.path.abspath(__file__)), ".dedup_index.db")
+
+# Stories first seen longer ago than this are pruned, and two entries whose
+# pubDates are further apart than this are never the same story
+DEDUP_WINDOW_DAYS = int(os.environ.get("DEDUP_WINDOW_DAYS", "7"))
+
+# Estimated title Jaccard similarity at or above which two entries are the same story.
+# Template headlines ("Patch Tuesday, May/June 2025 Edition") score 0.5-0.7, so keep this high
+DEDUP_SIMILARITY = float(os.environ.get("DEDUP_SIMILARITY", "0.8"))
+
+# 64 MinHash values split into 16 LSH bands of 4 rows: pairs above ~0.5
+# similarity share at least one band with high probability
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+
+# Character shingle length over the normalized title
+SHINGLE_SIZE = 5
+
+# Words that carry no information about which story a headline is about
+TITLE_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "by", "for", "from", "in", "into", "is", "it",
+    "its", "new", "of", "on", "or", "over", "the", "to", "via", "with",
+}
+
+# Story columns returned by every lookup, in the order _story() reads them
+STORY_COLUMNS = "s.id, s.source, s.link, s.title, s.ticket_key, s.slack_ts, s.score, s.priority"
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def _permutations():
+    """Fixed (a, b) coefficients for the MinHash family, identical across runs"""
+    seed = hashlib.sha256(b"rss-dedup-minhash").digest()
+    params = []
+    while len(params) < MINHASH_PERMUTATIONS:
+        seed = hashlib.sha256(seed).digest()
+        a, b = struct.unpack("<QQ", seed[:16])
+        params.append((a % (_MERSENNE_PRIME - 1) + 1, b % _MERSENNE_PRIME))
+    return params
+
+PERMUTATIONS = _permutations()
+
+def normalize_title(title):
+    """Lowercase a title and drop punctuation and stopwords"""
+    words = re.findall(r"[a-z0-9]+", str(title).lower())
+    return " ".join(word for word in words if word not in TITLE_STOPWORDS)
+
+def title_shingles(title):
+    """Set of character shingles of the normalized title"""
+    text = normalize_title(title)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def minhash(shingles):
+    """MinHash signature (tuple of MINHASH_PERMUTATIONS ints) of a shingle set, all zero if empty"""
+    if not shingles:
+        return (0,) * MINHASH_PERMUTATIONS
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles]
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in PERMUTATIONS
+    )
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+def band_keys(signature):
+    """One signed 64-bit bucket key per LSH band"""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<B{LSH_ROWS}I", band, *rows), digest_size=8).digest()
+        keys.append(struct.unpack("<q", digest)[0])
+    return keys
+
+class DedupIndex:
+    """Cross-source index of recently alerted stories.
+
+    A story from another source, published within the dedup window of the
+    entry, is found again either through shared CVE IDs or through a title
+    whose MinHash signature shares an LSH band bucket and is at least
+    DEDUP_SIMILARITY similar. Entries from the same source are never folded
+    together. Both lookups are a handful of indexed queries, so their cost
+    does not grow with the number of stories.
+    """
+
+    def __init__(self, path=DEDUP_INDEX_FILE, window_days=DEDUP_WINDOW_DAYS, threshold=DEDUP_SIMILARITY):
+        self.path = path
+        self.window_days = window_days
+        self.threshold = threshold
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS dedup_stories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                first_seen REAL NOT NULL,
+                source TEXT NOT NULL,
+                link TEXT NOT NULL,
+                title TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                ticket_key TEXT,
+                slack_ts TEXT
+            )
+        """)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS dedup_bands (bucket INTEGER NOT NULL, story_id INTEGER NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS dedup_cves (cve TEXT NOT NULL, story_id INTEGER NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_dedup_bands_bucket ON dedup_bands (bucket)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_dedup_cves_cve ON dedup_cves (cve)")
+        # published is the pubDate of the story's first entry (epoch seconds), NULL when the feed gave none;
+        # score and priority are the highest severity any of its entries reached
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(dedup_stories)")}
+        for column, kind in (("published", "REAL"), ("score", "REAL"), ("priority", "TEXT")):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE dedup_stories ADD COLUMN {column} {kind}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_dedup_stories_first_seen ON dedup_stories (first_seen)")
+        self.conn.commit()
+
+    @staticmethod
+    def signature(title):
+        """MinHash signature of an entry's normalized title"""
+        return minhash(title_shingles(title))
+
+    def find(self, signature, cves, source, published=None):
+        """Return the matching story from a source other than `source` as a dict, or None.
+
+        `published` is the entry's pubDate in epoch seconds; stories published
+        more than the window away from it are skipped (undated entries and
+        stories only use the first-seen cutoff). Shared CVE IDs win: one is
+        enough when both sides mention a single CVE, but a multi-CVE roundup
+        only matches a story it shares at least two CVEs with. Otherwise the
+        most similar title among the LSH candidates is used if it clears the
+        threshold.
+        """
+        window = self.window_days * 86400
+        candidates = """
+            s.source != ? AND s.first_seen >= ?
+            AND (? IS NULL OR s.published IS NULL OR ABS(s.published - ?) <= ?)
+        """
+        params = (source, time.time() - window, published, published, window)
+        if cves:
+            marks = ",".join("?" * len(cves))
+            row = self.conn.execute(f"""
+                SELECT {STORY_COLUMNS}, COUNT(*) AS shared,
+                    (SELECT COUNT(*) FROM dedup_cves t WHERE t.story_id = s.id) AS total
+                FROM dedup_cves c
+                JOIN dedup_stories s ON s.id = c.story_id
+                WHERE c.cve IN ({marks}) AND {candidates}
+                GROUP BY s.id
+                HAVING shared >= CASE WHEN ? = 1 AND total = 1 THEN 1 ELSE 2 END
+                ORDER BY shared DESC, s.id LIMIT 1
+            """, (*cves, *params, len(cves))).fetchone()
+            if row:
+                return self._story(row)
+
+        if not any(signature):
+            return None
+        keys = band_keys(signature)
+        marks = ",".join("?" * len(keys))
+        rows = self.conn.execute(f"""
+            SELECT DISTINCT {STORY_COLUMNS}, s.signature FROM dedup_bands b
+            JOIN dedup_stories s ON s.id = b.story_id
+            WHERE b.bucket IN ({marks}) AND {candidates}
+        """, (*keys, *params)).fetchall()
+        best, best_score = None, self.threshold
+        for row in rows:
+            score = similarity(signature, struct.unpack(f"<{MINHASH_PERMUTATIONS}I", row[8]))
+            if score >= best_score:
+                best, best_score = row, score
+        return self._story(best) if best else None
+
+    def add(self, source, link, title, signature, cves, published=None, score=None, priority=None):
+        """Index a new story, returning its ID"""
+        cursor = self.conn.execute(
+            "INSERT INTO dedup_stories (first_seen, source, link, title, signature, published, score, priority) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (time.time(), source, link, title, struct.pack(f"<{MINHASH_PERMUTATIONS}I", *signature), published, score, priority),
+        )
+        story_id = cursor.lastrowid
+        if any(signature):
+            self.conn.executemany(
+                "INSERT INTO dedup_bands (bucket, story_id) VALUES (?, ?)",
+                [(key, story_id) for key in band_keys(signature)],
+            )
+        self.conn.executemany("INSERT INTO dedup_cves (cve, story_id) VALUES (?, ?)", [(cve, story_id) for cve in cves])
+        self.conn.commit()
+        return story_id
+
+    def update(self, story_id, ticket_key=None, slack_ts=None, score=None, priority=None):
+        """Record the ticket and Slack message a story was alerted with, or its raised severity"""
+        self.conn.execute(
+            """UPDATE dedup_stories SET ticket_key = COALESCE(?, ticket_key), slack_ts = COALESCE(?, slack_ts),
+                score = COALESCE(?, score), priority = COALESCE(?, priority) WHERE id = ?""",
+            (ticket_key, slack_ts, score, priority, story_id),
+        )
+        self.conn.commit()
+
+    def get(self, story_id):
+        row = self.conn.execute(
+            f"SELECT {STORY_COLUMNS} FROM dedup_stories s WHERE s.id = ?", (story_id,)
+        ).fetchone()
+        return self._story(row) if row else None
+
+    def prune(self):
+        """Drop stories older than the dedup window, returning how many were removed"""
+        cutoff = time.time() - self.window_days * 86400
+        stale = "SELECT id FROM dedup_stories WHERE first_seen < ?"
+        self.conn.execute(f"DELETE FROM dedup_bands WHERE story_id IN ({stale})", (cutoff,))
+        self.conn.execute(f"DELETE FROM dedup_cves WHERE story_id IN ({stale})", (cutoff,))
+        cursor = self.conn.execute("DELETE FROM dedup_stories WHERE first_seen < ?", (cutoff,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    @staticmethod
+    def _story(row):
+        return {
+            "id": row[0], "source": row[1], "link": row[2], "title": row[3], "ticket_key": row[4], "slack_ts": row[5],
+            "score": row[6], "priority": row[7],
+        }
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,127 @@
+import argparse
+import calendar
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+ENTRY_INDEX_FILE = os.path.join(os.environ.get("FEED_DATA_DIR") or os.path.dirname(os.path.abspath(__file__)), ".entry_index.db")
+
+# Entries published longer ago than this are pruned at the end of each run
+ENTRY_INDEX_MAX_AGE_DAYS = int(os.environ.get("ENTRY_INDEX_MAX_AGE_DAYS", "400"))
+
+class EntryIndex:
+    """SQLite FTS5 full-text index of every fetched entry, matched or not.
+
+    Entries are keyed by link, so an entry seen on many runs is indexed
+    once. The FTS table uses `entries` as external content and is kept in
+    sync by triggers. add() only writes inside the open transaction; call
+    flush() once per source to commit.
+    """
+
+    def __init__(self, path=ENTRY_INDEX_FILE, max_age_days=ENTRY_INDEX_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age_days = max_age_days
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                link TEXT NOT NULL UNIQUE,
+                source TEXT NOT NULL,
+                published REAL NOT NULL,
+                title TEXT NOT NULL,
+                text TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_published ON entries (published);
+            CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                title, text, content='entries', content_rowid='id', tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+                INSERT INTO entries_fts (rowid, title, text) VALUES (new.id, new.title, new.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+                INSERT INTO entries_fts (entries_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+            END;
+        """)
+        self.conn.commit()
+
+    def add(self, source, entry, text):
+        """Index an entry with its HTML-stripped description, unless its link is already indexed"""
+        link = getattr(entry, 'link', None) or getattr(entry, 'id', None)
+        if not link:
+            return False
+        published = getattr(entry, 'published_parsed', None)
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO entries (link, source, published, title, text) VALUES (?, ?, ?, ?, ?)",
+            (link, source, calendar.timegm(published) if published else time.time(), str(getattr(entry, 'title', '')), text),
+        )
+        return cursor.rowcount == 1
+
+    def flush(self):
+        self.conn.commit()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def search(self, query, days=None, source=None, limit=20):
+        """Best-ranked (bm25) entries matching an FTS5 query, newest first among equal ranks"""
+        sql = """
+            SELECT e.source, e.published, e.link, e.title, snippet(entries_fts, 1, '[', ']', '…', 12)
+            FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid
+            WHERE entries_fts MATCH ?
+        """
+        params = [query]
+        if days:
+            sql += " AND e.published >= ?"
+            params.append(time.time() - days * 86400)
+        if source:
+            sql += " AND e.source = ?"
+            params.append(source)
+        sql += " ORDER BY bm25(entries_fts, 2.0, 1.0), e.published DESC LIMIT ?"
+        params.append(limit)
+        return self.conn.execute(sql, params).fetchall()
+
+    def prune(self, max_age_days=None):
+        """Delete entries published more than max_age_days ago, returning how many were removed"""
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        cursor = self.conn.execute("DELETE FROM entries WHERE published < ?", (time.time() - max_age_days * 86400,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+def phrase_query(text):
+    """Turn plain search words into an FTS5 query requiring each word (quoted, so punctuation is safe)"""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search every fetched feed entry")
+    parser.add_argument("query", nargs="+", help="Words that must all appear (or an FTS5 query with --raw)")
+    parser.add_argument("--days", type=int, help="Only entries published in the last N days")
+    parser.add_argument("--source", help="Only entries from this source")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum results (default 20)")
+    parser.add_argument("--raw", action="store_true", help="Pass the query to FTS5 as-is (AND/OR/NOT, prefix*, \"phrases\")")
+    parser.add_argument("--db", default=ENTRY_INDEX_FILE, help="Index file to search")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        parser.error(f"no entry index at {args.db} - run the feed filters first")
+    index = EntryIndex(args.db)
+    text = " ".join(args.query)
+    start = time.perf_counter()
+    try:
+        results = index.search(text if args.raw else phrase_query(text), args.days, args.source, args.limit)
+    except sqlite3.OperationalError as e:
+        parser.error(f"bad query: {e}")
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for source, published, link, title, snippet in results:
+        day = datetime.fromtimestamp(published, timezone.utc).strftime("%Y-%m-%d")
+        print(f"{day}  [{source}] {title}\n            {link}\n            {snippet}")
+    print(f"🔎 {len(results)} result{'s' if len(results) != 1 else ''} of {index.count()} indexed entries in {elapsed:.1f} ms")
+    index.close()
+
+if __name__ == "__main__":
+    main()
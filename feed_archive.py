@@ -0,0 +1,124 @@
+import calendar
+import hashlib
+import os
+import sqlite3
+import time
+import zlib
+from feed_writer import render_item
+
+FEED_ARCHIVE_DB_FILE = os.path.join(os.environ.get("FEED_DATA_DIR") or os.path.dirname(os.path.abspath(__file__)), ".feed_archive.db")
+
+# Each output feed keeps at most this many matched items, none older than this many days
+ARCHIVE_MAX_ITEMS = int(os.environ.get("ARCHIVE_MAX_ITEMS", "100"))
+ARCHIVE_MAX_AGE_DAYS = int(os.environ.get("ARCHIVE_MAX_AGE_DAYS", "90"))
+
+def published_timestamp(entry):
+    """Publication time of an entry as epoch seconds, or None if it has none"""
+    published = getattr(entry, 'published_parsed', None)
+    return calendar.timegm(published) if published else None
+
+class FeedArchive:
+    """SQLite store of the matched items behind each rolling output feed.
+
+    Each item is rendered once, when it first matches, and kept as
+    compressed <item> XML. Newer items are listed first, ordered by
+    publication time and then insertion order, and an item never moves once
+    stored. prune() keeps the newest max_items per source that are also
+    within max_age_days.
+    """
+
+    def __init__(self, path=FEED_ARCHIVE_DB_FILE, max_items=ARCHIVE_MAX_ITEMS, max_age_days=ARCHIVE_MAX_AGE_DAYS):
+        self.path = path
+        self.max_items = max_items
+        self.max_age_days = max_age_days
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS archive_items (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                link TEXT NOT NULL,
+                published REAL NOT NULL,
+                item BLOB NOT NULL,
+                UNIQUE (source, link)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_archive_items_order ON archive_items (source, published DESC, seq DESC)")
+        # Sources whose archive has been built from a full filter pass or an existing output feed
+        self.conn.execute("CREATE TABLE IF NOT EXISTS archive_sources (source TEXT PRIMARY KEY, built REAL NOT NULL)")
+        self.conn.commit()
+
+    def is_built(self, source):
+        """True once the source's archive holds every current match, even if that is none"""
+        return self.conn.execute("SELECT 1 FROM archive_sources WHERE source = ?", (source,)).fetchone() is not None
+
+    def mark_built(self, source):
+        if not self.is_built(source):
+            self.conn.execute("INSERT INTO archive_sources (source, built) VALUES (?, ?)", (source, time.time()))
+            self.conn.commit()
+
+    def count(self, source):
+        return self.conn.execute("SELECT COUNT(*) FROM archive_items WHERE source = ?", (source,)).fetchone()[0]
+
+    def add(self, source, entries):
+        """Store entries (newest first) not archived yet, returning how many were added.
+
+        Entries older than the retention window are skipped, so they are not
+        added and pruned again on every run.
+        """
+        now = time.time()
+        cutoff = now - self.max_age_days * 86400
+        added = 0
+        # Insert oldest first so entries sharing a timestamp keep their feed order
+        for entry in reversed(entries):
+            link = str(getattr(entry, 'link', '') or '')
+            published = published_timestamp(entry) or now
+            if not link or published < cutoff:
+                continue
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO archive_items (source, link, published, item) VALUES (?, ?, ?, ?)",
+                (source, link, published, zlib.compress(render_item(entry))),
+            )
+            added += cursor.rowcount
+        self.conn.commit()
+        return added
+
+    def prune(self, source):
+        """Drop items beyond the newest max_items or older than max_age_days, returning how many"""
+        cutoff = time.time() - self.max_age_days * 86400
+        cursor = self.conn.execute("""
+            DELETE FROM archive_items WHERE source = ? AND (
+                published < ? OR seq NOT IN (
+                    SELECT seq FROM archive_items WHERE source = ?
+                    ORDER BY published DESC, seq DESC LIMIT ?
+                )
+            )
+        """, (source, cutoff, source, self.max_items))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def digest(self, source, channel):
+        """SHA-256 of the channel header and the archived item IDs, in feed order.
+
+        Stored items never change, so this identifies the rendered feed
+        without reading any item bodies.
+        """
+        digest = hashlib.sha256()
+        for value in channel:
+            digest.update(value.encode("utf-8") + b"\0")
+        rows = self.conn.execute(
+            "SELECT seq FROM archive_items WHERE source = ? ORDER BY published DESC, seq DESC", (source,)
+        )
+        for (seq,) in rows:
+            digest.update(f"{seq},".encode())
+        return digest.hexdigest()
+
+    def items(self, source):
+        """Yield each archived <item> as XML bytes, newest first"""
+        rows = self.conn.execute(
+            "SELECT item FROM archive_items WHERE source = ? ORDER BY published DESC, seq DESC", (source,)
+        )
+        for (item,) in rows:
+            yield zlib.decompress(item)
+
+    def close(self):
+        self.conn.close()
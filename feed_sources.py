@@ -0,0 +1,90 @@
+import os
+
+# State and cache files live next to the scripts unless FEED_DATA_DIR points elsewhere (e.g. for replays)
+BASE_DIR = os.environ.get("FEED_DATA_DIR") or os.path.dirname(os.path.abspath(__file__))
+
+# Filtered output feeds, one per source
+OUTPUT_DIR = os.path.join(BASE_DIR, "feeds")
+
+def exclude_ics_advisories(entry):
+    """Skip ICS-related CISA advisories"""
+    return "/ics" in str(getattr(entry, 'link', ''))
+
+# Registry of every RSS source the runner knows about, keyed by short name.
+# severity_weight is added to the severity score of every alert from the source.
+# Each feed_url can be pointed elsewhere with <NAME>_FEED_URL, e.g. CISA_FEED_URL.
+SOURCES = {
+    "bleeping": {
+        "name": "bleeping",
+        "feed_url": os.environ.get("BLEEPING_FEED_URL", "https://www.bleepingcomputer.com/feed/"),
+        "legacy_cache_file": os.path.join(BASE_DIR, ".seen_entries_bleeping.json"),
+        "state_file": os.path.join(BASE_DIR, ".feed_state_bleeping.json"),
+        "output_file": "bleeping-products.xml",
+        "channel_title": "Filtered - BleepingComputer",
+        "channel_description": "Filtered BleepingComputer entries for Arcadia",
+        "slack_prefix": "🧠 BleepingComputer",
+        "jira_source": "BleepingComputer RSS Feed",
+        "exclude": None,
+        "severity_weight": 0,
+    },
+    "cisa": {
+        "name": "cisa",
+        "feed_url": os.environ.get("CISA_FEED_URL", "https://www.cisa.gov/cybersecurity-advisories/all.xml"),
+        "legacy_cache_file": os.path.join(BASE_DIR, ".seen_entries_cisa.json"),
+        "state_file": os.path.join(BASE_DIR, ".feed_state_cisa.json"),
+        "output_file": "cisa-products.xml",
+        "channel_title": "Filtered - CISA Advisories",
+        "channel_description": "Filtered CISA advisories for Arcadia-relevant threats",
+        "slack_prefix": "🛡️ CISA",
+        "jira_source": "CISA Advisories RSS Feed",
+        "exclude": exclude_ics_advisories,
+        "severity_weight": 3,
+    },
+    "darkreading": {
+        "name": "darkreading",
+        "feed_url": os.environ.get("DARKREADING_FEED_URL", "https://www.darkreading.com/rss.xml"),
+        "legacy_cache_file": os.path.join(BASE_DIR, ".seen_entries_darkreading.json"),
+        "state_file": os.path.join(BASE_DIR, ".feed_state_darkreading.json"),
+        "output_file": "darkreading-products.xml",
+        "channel_title": "Filtered - Dark Reading",
+        "channel_description": "Filtered Dark Reading entries for Arcadia",
+        "slack_prefix": "🌑 Dark Reading",
+        "jira_source": "Dark Reading RSS Feed",
+        "exclude": None,
+        "severity_weight": 0,
+    },
+    "hackernews": {
+        "name": "hackernews",
+        "feed_url": os.environ.get("HACKERNEWS_FEED_URL", "https://thehackernews.com/rss.xml"),
+        "legacy_cache_file": os.path.join(BASE_DIR, ".seen_entries_hackernews.json"),
+        "state_file": os.path.join(BASE_DIR, ".feed_state_hackernews.json"),
+        "output_file": "hackernews-products.xml",
+        "channel_title": "Filtered - Hacker News",
+        "channel_description": "Hacker News alerts filtered for Arcadia-relevant products and threats",
+        "slack_prefix": "💻 Hacker News",
+        "jira_source": "Hacker News RSS Feed",
+        "exclude": None,
+        "severity_weight": 0,
+    },
+    "krebs": {
+        "name": "krebs",
+        "feed_url": os.environ.get("KREBS_FEED_URL", "https://krebsonsecurity.com/feed/"),
+        "legacy_cache_file": os.path.join(BASE_DIR, ".seen_entries_krebs.json"),
+        "state_file": os.path.join(BASE_DIR, ".feed_state_krebs.json"),
+        "output_file": "krebs-products.xml",
+        "channel_title": "Filtered - Krebs on Security",
+        "channel_description": "Filtered Krebs on Security entries for Arcadia",
+        "slack_prefix": "🔍 Krebs",
+        "jira_source": "Krebs on Security RSS Feed",
+        "exclude": None,
+        "severity_weight": 0,
+    },
+}
+
+def source_for_file(path):
+    """Source name a feed file belongs to, from its output file name or name prefix"""
+    filename = os.path.basename(path)
+    for name, source in SOURCES.items():
+        if filename == source["output_file"] or filename.startswith(name):
+            return name
+    return None
@@ -0,0 +1,154 @@
+import email.utils
+import hashlib
+import tempfile
+from datetime import datetime
+from xml.etree.ElementTree import iterparse
+import feedparser
+from feedparser import FeedParserDict
+
+# Feed bodies larger than this are spooled to a temp file rather than held in memory
+SPOOL_MAX_BYTES = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# RSS <item> and Atom <entry> elements
+ITEM_TAGS = ("item", "entry")
+
+# Child element (local name) -> entry field; the first non-empty one wins
+FIELD_TAGS = {
+    "title": "title",
+    "description": "description",
+    "summary": "description",
+    "guid": "id",
+    "id": "id",
+    "pubDate": "published",
+    "published": "published",
+    "date": "published",
+    "updated": "published",
+}
+
+def local_name(tag):
+    """Tag name without its XML namespace"""
+    return tag.rsplit("}", 1)[-1]
+
+def parse_date(value):
+    """RFC 822 (RSS) or ISO 8601 (Atom) date string -> UTC struct_time, or None"""
+    if not value:
+        return None
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return parsed.utctimetuple()
+
+def item_link(item):
+    """Link of an <item>/<entry> element without building the whole entry"""
+    for child in item:
+        if local_name(child.tag) != "link":
+            continue
+        if child.get("href") is not None:
+            if child.get("rel", "alternate") == "alternate":
+                return child.get("href").strip()
+        elif child.text:
+            return child.text.strip()
+    return None
+
+def element_to_entry(item):
+    """Build a feedparser-style entry from an <item>/<entry> element"""
+    entry = FeedParserDict()
+    content = None
+    for child in item:
+        name = local_name(child.tag)
+        field = FIELD_TAGS.get(name)
+        if field and field not in entry:
+            text = "".join(child.itertext()).strip()
+            if text:
+                entry[field] = text
+        elif name in ("content", "encoded") and content is None:
+            content = "".join(child.itertext()).strip()
+    link = item_link(item)
+    if link:
+        entry["link"] = link
+    if "description" not in entry and content:
+        entry["description"] = content
+    if "published" in entry:
+        entry["published_parsed"] = parse_date(entry["published"])
+    return entry
+
+def iter_items(fileobj):
+    """Yield each <item>/<entry> element of an RSS/Atom document as it is parsed.
+
+    Each element is cleared and detached from its parent once the caller
+    moves on, so memory stays flat no matter how long the feed is.
+    """
+    stack = []
+    for event, elem in iterparse(fileobj, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if local_name(elem.tag) in ITEM_TAGS:
+            yield elem
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+def iter_entries(fileobj):
+    """Yield feedparser-style entries from an RSS/Atom document, one at a time"""
+    for item in iter_items(fileobj):
+        yield element_to_entry(item)
+
+class StreamedFeed(dict):
+    """Result of a streaming fetch: status, validators and body hash, with the body parsed on demand.
+
+    Answers the same .get("status"/"etag"/"modified") calls as a feedparser
+    result, plus "sha256" and "bytes" of the raw body. The body sits in a
+    spooled temp file until iter_items() walks it.
+    """
+
+    def __init__(self, status, etag=None, modified=None, body=None, sha256=None, content_type=None):
+        super().__init__(status=status, etag=etag, modified=modified, sha256=sha256, bytes=body.tell() if body else 0)
+        self.body = body
+        self.content_type = content_type
+
+    def iter_items(self):
+        if self.body is None:
+            return iter(())
+        self.body.seek(0)
+        return iter_items(self.body)
+
+    def to_feedparser(self):
+        """Parse the whole body with feedparser, for documents iterparse rejects"""
+        self.body.seek(0)
+        headers = {"content-type": self.content_type} if self.content_type else None
+        parsed = feedparser.parse(self.body.read(), response_headers=headers)
+        parsed.update(self)
+        return parsed
+
+    def close(self):
+        if self.body is not None:
+            self.body.close()
+            self.body = None
+
+def download_feed(session, url, etag=None, modified=None, timeout=30):
+    """Conditionally GET a feed, streaming the body into a spooled temp file and hashing it"""
+    headers = {"User-Agent": feedparser.USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304:
+            return StreamedFeed(304, etag, modified)
+        response.raise_for_status()
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        digest = hashlib.sha256()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            body.write(chunk)
+            digest.update(chunk)
+    return StreamedFeed(
+        response.status_code, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+        body, digest.hexdigest(), response.headers.get("Content-Type"),
+    )
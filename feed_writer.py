@@ -0,0 +1,57 @@
+import os
+import re
+from xml.etree.ElementTree import Element, SubElement, tostring
+from xml.sax.saxutils import escape
+
+# Leading comment recording the digest of the item set a feed file was written from
+DIGEST_PATTERN = re.compile(rb"^<!-- digest: ([0-9a-f]{64}) -->")
+
+def item_fields(entry):
+    """(title, link, description, pubDate) text written for an entry"""
+    return (
+        str(getattr(entry, 'title', '')),
+        str(getattr(entry, 'link', '')),
+        str(getattr(entry, 'description', '')),
+        str(getattr(entry, 'published', '')),
+    )
+
+def stored_digest(path):
+    """Digest recorded at the top of an existing feed file, or None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        match = DIGEST_PATTERN.match(f.read(100))
+    return match.group(1).decode() if match else None
+
+def render_item(entry):
+    """Serialize a single <item> element"""
+    item = Element("item")
+    title, link, description, published = item_fields(entry)
+    SubElement(item, "title").text = title
+    SubElement(item, "link").text = link
+    SubElement(item, "description").text = description
+    SubElement(item, "pubDate").text = published
+    return tostring(item, encoding="utf-8")
+
+def write_feed(path, channel, items, digest):
+    """Write an RSS 2.0 feed from rendered <item> XML unless it already has this digest.
+
+    channel is (title, link, description) and items is an iterable of
+    render_item() bytes. The file is streamed out one item at a time to a
+    temp file and moved into place, so the full document is never held in
+    memory and readers never see a partial file. Returns True if written.
+    """
+    if stored_digest(path) == digest:
+        return False
+
+    title, link, description = channel
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(f"<!-- digest: {digest} -->".encode("utf-8"))
+        f.write(b'<rss version="2.0"><channel>')
+        f.write(f"<title>{escape(title)}</title><link>{escape(link)}</link><description>{escape(description)}</description>".encode("utf-8"))
+        for item in items:
+            f.write(item)
+        f.write(b"</channel></rss>")
+    os.replace(tmp_path, path)
+    return True
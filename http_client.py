@@ -0,0 +1,83 @@
+import base64
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from rate_limiter import SLACK_RATE_LIMITER, JIRA_RATE_LIMITER, slack_method, jira_method
+
+# Per-service cap on requests in flight at once
+SLACK_MAX_CONCURRENCY = int(os.environ.get("SLACK_MAX_CONCURRENCY", "4"))
+JIRA_MAX_CONCURRENCY = int(os.environ.get("JIRA_MAX_CONCURRENCY", "4"))
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class RetryPolicy(Retry):
+    """Exponential backoff that honors Retry-After.
+
+    Idempotent requests (GET/PUT/...) are retried on 429 and 5xx. POSTs are
+    only retried on 429, since a 5xx may mean the ticket or message was
+    already created.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method and method.upper() == "POST":
+            return bool(self.total) and status_code == 429
+        return super().is_retry(method, status_code, has_retry_after)
+
+class LimitedSession(requests.Session):
+    """Session that allows at most max_concurrency requests in flight at once.
+
+    With a rate_limiter, each request first takes a token from the bucket
+    for its API method (rate_key(url)), shaping traffic before it hits the
+    service's limits.
+    """
+
+    def __init__(self, max_concurrency=None, rate_limiter=None, rate_key=None):
+        super().__init__()
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.rate_limiter = rate_limiter
+        self.rate_key = rate_key
+
+    def request(self, method, url, *args, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self.rate_key(url))
+        if self._slots is None:
+            return super().request(method, url, *args, **kwargs)
+        with self._slots:
+            return super().request(method, url, *args, **kwargs)
+
+def build_session(headers=None, retries=5, backoff_factor=0.5, pool_maxsize=10, max_concurrency=None, rate_limiter=None, rate_key=None):
+    """Create a keep-alive session with connection pooling, retry/backoff and optional concurrency and rate caps"""
+    retry = RetryPolicy(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=max(pool_maxsize, max_concurrency or 0))
+    session = LimitedSession(max_concurrency, rate_limiter, rate_key)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+def slack_session(token, max_concurrency=SLACK_MAX_CONCURRENCY):
+    """Pooled session for the Slack Web API with the bot token pre-set"""
+    return build_session(
+        {"Authorization": f"Bearer {token}"},
+        max_concurrency=max_concurrency,
+        rate_limiter=SLACK_RATE_LIMITER,
+        rate_key=slack_method,
+    )
+
+def jira_session(email, api_token, max_concurrency=JIRA_MAX_CONCURRENCY):
+    """Pooled session for the JIRA REST API with the Basic auth header built once"""
+    credentials = base64.b64encode(f"{email}:{api_token}".encode()).decode()
+    return build_session({
+        "Authorization": f"Basic {credentials}",
+        "Accept": "application/json",
+    }, max_concurrency=max_concurrency, rate_limiter=JIRA_RATE_LIMITER, rate_key=jira_method)
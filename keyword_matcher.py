@@ -0,0 +1,105 @@
+import re
+from collections import deque
+
+from cve_index import extract_cves
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over every keyword category.
+
+    Keywords are lowercased and compiled once; match() then finds every
+    keyword hit in a single pass over the text, with the same
+    case-insensitive substring semantics as `keyword.lower() in text`.
+    """
+
+    def __init__(self, categories):
+        self.categories = {name: list(words) for name, words in categories.items()}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._always = []
+
+        for name, words in self.categories.items():
+            for index, word in enumerate(words):
+                pattern = word.lower()
+                if not pattern:
+                    # An empty keyword is a substring of every text
+                    self._always.append((name, index))
+                    continue
+                state = 0
+                for char in pattern:
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append([])
+                        self._goto[state][char] = next_state
+                    state = next_state
+                self._out[state].append((name, index))
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def scan(self, text):
+        """Return the set of (category, keyword index) pairs found in already-lowercased text"""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        hits = set(self._always)
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                hits.update(out[state])
+        return hits
+
+    def match(self, text):
+        """Return {category: [keywords found]} for text, in keyword list order"""
+        return self.match_lowered(text.lower())
+
+    def match_lowered(self, text):
+        """Same as match() for text the caller has already lowercased"""
+        hits = self.scan(text)
+        result = {name: [] for name in self.categories}
+        for name, index in sorted(hits, key=lambda hit: hit[1]):
+            result[name].append(self.categories[name][index])
+        return result
+
+def is_alert(hits):
+    """Apply the product/threat/other alert rule to per-category keyword hits"""
+    products, threats, others = hits["products"], hits["threats"], hits["others"]
+    return bool(
+        (products and threats)
+        or (threats and others)
+        or (products and threats and others)
+    )
+
+def strip_html_tags(text):
+    return re.sub(r'<[^>]+>', '', text or '')
+
+def match_entry(entry, matcher):
+    """Scan an entry once, returning its keyword hits plus the cleaned and normalized text.
+
+    The result is carried through to ticket creation and the Slack message so
+    no entry is lowercased or scanned again.
+    """
+    clean_description = strip_html_tags(getattr(entry, 'description', ''))
+    text = (str(getattr(entry, 'title', '')) + ' ' + clean_description).lower()
+    match = matcher.match_lowered(text)
+    match["clean_description"] = clean_description
+    match["text"] = text
+    match["cves"] = extract_cves(text)
+    return match
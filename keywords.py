@@ -0,0 +1,19 @@
+# Keyword lists shared by every feed source
+
+# Product keywords to monitor for security threats
+# Add specific products, technologies, or services your organization uses
+# Examples: "microsoft", "aws", "github", "palo alto", "crowdstrike", "1password"
+PRODUCT_KEYWORDS = [
+]
+
+# Threat keywords that indicate security vulnerabilities or incidents
+# Add security threat terms that will trigger alerts for your organization
+# Examples: "cve", "vulnerability", "exploit", "breach", "malware", "ransomware", "zero-day", "apt", "supply chain"
+THREAT_KEYWORDS = [
+]
+
+# Other keywords that might be relevant to your organization
+# Add company names, industry-specific terms, or other relevant keywords
+# Examples: "healthcare", "finance", "retail", "manufacturing", "education"
+OTHER_KEYWORDS = [
+]
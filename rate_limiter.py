@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+# Slack Web API rate limit tiers, in requests per minute
+SLACK_TIER_LIMITS = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# Published tier of every Slack method the scripts call; chat.postMessage is
+# "special" at roughly one message per second per channel
+SLACK_METHOD_LIMITS = {
+    "chat.postMessage": 60,
+    "reactions.get": SLACK_TIER_LIMITS[3],
+    "conversations.history": SLACK_TIER_LIMITS[3],
+    "conversations.replies": SLACK_TIER_LIMITS[3],
+    "users.info": SLACK_TIER_LIMITS[4],
+}
+
+# JIRA Cloud does not publish fixed per-user limits, so keep a conservative default
+JIRA_REQUESTS_PER_MINUTE = int(os.environ.get("JIRA_REQUESTS_PER_MINUTE", "300"))
+
+# Multiplies every limit; 0 turns rate limiting off (e.g. against the local replay stand-in)
+RATE_LIMIT_SCALE = float(os.environ.get("RATE_LIMIT_SCALE", "1"))
+
+class TokenBucket:
+    """Token bucket refilled at `per_minute` tokens a minute, holding up to `burst` tokens.
+
+    acquire() reserves a token and sleeps until it is due, so concurrent
+    callers are spaced out instead of all hitting the API at once.
+    """
+
+    def __init__(self, per_minute, burst=None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst or max(1, per_minute // 10))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+class RateLimiter:
+    """One token bucket per API method, with a fallback bucket for unlisted methods"""
+
+    def __init__(self, limits, default_per_minute, scale=RATE_LIMIT_SCALE):
+        self.limits = dict(limits)
+        self.default_per_minute = default_per_minute
+        self.scale = scale
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, method):
+        with self._lock:
+            bucket = self._buckets.get(method)
+            if bucket is None:
+                bucket = TokenBucket(self.limits.get(method, self.default_per_minute) * self.scale)
+                self._buckets[method] = bucket
+            return bucket
+
+    def acquire(self, method):
+        if not self.scale:
+            return 0
+        return self.bucket(method).acquire()
+
+def slack_method(url):
+    """Slack Web API method name from a request URL, e.g. "chat.postMessage" """
+    return urlparse(url).path.rsplit("/", 1)[-1]
+
+def jira_method(url):
+    """JIRA limits apply per user rather than per endpoint, so every call shares one bucket"""
+    return "jira"
+
+SLACK_RATE_LIMITER = RateLimiter(SLACK_METHOD_LIMITS, SLACK_TIER_LIMITS[2])
+JIRA_RATE_LIMITER = RateLimiter({}, JIRA_REQUESTS_PER_MINUTE)
@@ -0,0 +1,434 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from cve_index import CVE_INDEX_FILE
+from feed_sources import SOURCES, source_for_file
+from snapshot_store import SNAPSHOT_DIR, SnapshotStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Identity the stand-in reports for every thumbs up
+REPLAY_USER = {"id": "U0REPLAY", "name": "replay.user", "profile": {"email": "replay.user@example.com"}}
+REPLAY_ACCOUNT_ID = "replay-account"
+REPLAY_PROJECT = "REPLAY"
+
+# Seconds a throttled (429) response asks the client to wait
+THROTTLE_RETRY_AFTER = 1
+
+# Messages per conversations.history page when the caller gives no limit
+HISTORY_PAGE_SIZE = 200
+
+class FakeServices(ThreadingHTTPServer):
+    """Local stand-in for the feed hosts, the Slack Web API and the JIRA REST API.
+
+    Every API call sleeps latency plus an exponentially distributed jitter,
+    and fails with a 503 (error_rate) or a 429 (throttle_rate). Faults and
+    delays come from one seeded RNG so a replay can be repeated. Feeds are
+    served unmodified and never delayed. Each call is recorded in `calls`
+    as (endpoint, status, seconds).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, feeds, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, ack_rate=1.0, seed=0):
+        super().__init__(("127.0.0.1", 0), FakeServiceHandler)
+        self.feeds = feeds
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.ack_rate = ack_rate
+        self.random = random.Random(seed)
+        self.calls = []
+        self.messages = []
+        self.by_ts = {}
+        self.issues = 0
+        self._last_ts = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def draw(self):
+        """(delay seconds, fault status or None) for the next API call"""
+        with self._lock:
+            delay = self.latency + (self.random.expovariate(1 / self.jitter) if self.jitter else 0.0)
+            roll = self.random.random()
+        if roll < self.error_rate:
+            return delay, 503
+        if roll < self.error_rate + self.throttle_rate:
+            return delay, 429
+        return delay, None
+
+    def record(self, endpoint, status, seconds):
+        with self._lock:
+            self.calls.append((endpoint, status, seconds))
+
+    def post_message(self, data):
+        """Store a posted message like Slack would, returning its ts"""
+        with self._lock:
+            self._last_ts = max(time.time(), self._last_ts + 0.000001)
+            ts = f"{self._last_ts:.6f}"
+            parent = self.by_ts.get(data.get("thread_ts"))
+            message = {"ts": ts, "text": data.get("text", ""), "posted_at": time.time()}
+            if parent is not None:
+                parent["replies"].append(message)
+            else:
+                message.update(replies=[], acked=self.random.random() < self.ack_rate)
+                self.messages.append(message)
+            self.by_ts[ts] = message
+        return ts
+
+    def next_issue(self):
+        with self._lock:
+            self.issues += 1
+            number = self.issues
+        return {"id": str(10000 + number), "key": f"{REPLAY_PROJECT}-{number}", "self": f"{self.url}/rest/api/3/issue/{10000 + number}"}
+
+def reactions(message):
+    if not message or not message.get("acked"):
+        return []
+    return [{"name": "+1", "users": [REPLAY_USER["id"]], "count": 1}]
+
+def slack_message(message):
+    """A stored message as conversations.history/replies return it"""
+    payload = {"ts": message["ts"], "text": message["text"]}
+    if "replies" in message:
+        payload["reply_count"] = len(message["replies"])
+        if reactions(message):
+            payload["reactions"] = reactions(message)
+    return payload
+
+class FakeServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # (method, path pattern, endpoint label, handler name)
+    ROUTES = [
+        ("GET", r"/feeds/(?P<name>\w+)", "feed", "feed"),
+        ("POST", r"/api/chat\.postMessage", "chat.postMessage", "post_message"),
+        ("GET", r"/api/reactions\.get", "reactions.get", "reactions_get"),
+        ("GET", r"/api/users\.info", "users.info", "users_info"),
+        ("GET", r"/api/conversations\.history", "conversations.history", "history"),
+        ("GET", r"/api/conversations\.replies", "conversations.replies", "replies"),
+        ("POST", r"/rest/api/3/issue", "POST /issue", "create_issue"),
+        ("POST", r"/rest/api/3/issue/bulk", "POST /issue/bulk", "create_issues"),
+        ("PUT", r"/rest/api/3/issue/[^/]+", "PUT /issue/{key}", "no_content"),
+        ("PUT", r"/rest/api/3/issue/[^/]+/assignee", "PUT /issue/{key}/assignee", "no_content"),
+        ("GET", r"/rest/api/3/issue/[^/]+/transitions", "GET /issue/{key}/transitions", "transitions"),
+        ("POST", r"/rest/api/3/issue/[^/]+/transitions", "POST /issue/{key}/transitions", "no_content"),
+        ("POST", r"/rest/api/3/issue/[^/]+/remotelink", "POST /issue/{key}/remotelink", "remote_link"),
+        ("GET", r"/rest/api/3/user/search", "GET /user/search", "user_search"),
+    ]
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def log_message(self, format, *args):
+        pass
+
+    def dispatch(self, method):
+        start = time.perf_counter()
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        for route_method, pattern, endpoint, handler in self.ROUTES:
+            match = re.fullmatch(pattern, url.path)
+            if route_method == method and match:
+                break
+        else:
+            self.respond(404, {"error": "not_found"})
+            self.server.record(f"{method} {url.path}", 404, time.perf_counter() - start)
+            return
+
+        if endpoint == "feed":
+            status = self.feed(match["name"])
+            self.server.record(endpoint, status, time.perf_counter() - start)
+            return
+        delay, fault = self.server.draw()
+        time.sleep(delay)
+        if fault == 429:
+            self.respond(429, {"ok": False, "error": "ratelimited"}, {"Retry-After": str(THROTTLE_RETRY_AFTER)})
+            status = 429
+        elif fault:
+            self.respond(fault, {"ok": False, "error": "service_unavailable"})
+            status = fault
+        else:
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            data = json.loads(body) if body else {}
+            status, payload = getattr(self, handler)(params, data)
+            self.respond(status, payload)
+        self.server.record(endpoint, status, time.perf_counter() - start)
+
+    def respond(self, status, payload=None, headers=None, content_type="application/json"):
+        body = b"" if payload is None else payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if payload is not None:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def feed(self, name):
+        body = self.server.feeds.get(name)
+        if body is None:
+            self.respond(404, {"error": "no_snapshot"})
+            return 404
+        self.respond(200, body, content_type="application/rss+xml")
+        return 200
+
+    def post_message(self, params, data):
+        ts = self.server.post_message(data)
+        return 200, {"ok": True, "channel": data.get("channel"), "ts": ts}
+
+    def reactions_get(self, params, data):
+        message = self.server.by_ts.get(params.get("timestamp"))
+        if message is None:
+            return 200, {"ok": False, "error": "message_not_found"}
+        return 200, {"ok": True, "type": "message", "message": {"ts": message["ts"], "reactions": reactions(message)}}
+
+    def users_info(self, params, data):
+        return 200, {"ok": True, "user": dict(REPLAY_USER, id=params.get("user", REPLAY_USER["id"]))}
+
+    def history(self, params, data):
+        oldest = float(params.get("oldest", 0))
+        latest = float(params.get("latest") or "inf")
+        messages = [m for m in reversed(self.server.messages) if oldest <= float(m["ts"]) <= latest]
+        offset = int(params.get("cursor") or 0)
+        limit = int(params.get("limit") or HISTORY_PAGE_SIZE)
+        page = messages[offset:offset + limit]
+        has_more = offset + limit < len(messages)
+        return 200, {
+            "ok": True,
+            "messages": [slack_message(m) for m in page],
+            "has_more": has_more,
+            "response_metadata": {"next_cursor": str(offset + limit) if has_more else ""},
+        }
+
+    def replies(self, params, data):
+        parent = self.server.by_ts.get(params.get("ts"))
+        if parent is None or "replies" not in parent:
+            return 200, {"ok": False, "error": "thread_not_found"}
+        return 200, {"ok": True, "messages": [slack_message(parent)] + [slack_message(m) for m in parent["replies"]]}
+
+    def create_issue(self, params, data):
+        return 201, self.server.next_issue()
+
+    def create_issues(self, params, data):
+        return 201, {"issues": [self.server.next_issue() for _ in data.get("issueUpdates", [])], "errors": []}
+
+    def transitions(self, params, data):
+        return 200, {"transitions": [{"id": "11", "name": "To Do"}, {"id": "21", "name": "In Progress"}]}
+
+    def remote_link(self, params, data):
+        return 201, {"id": 1, "self": f"{self.server.url}{self.path}/1"}
+
+    def user_search(self, params, data):
+        return 200, [{"accountId": REPLAY_ACCOUNT_ID, "emailAddress": params.get("query")}]
+
+    def no_content(self, params, data):
+        return 204, None
+
+def read_feed_file(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        return f.read()
+
+def load_snapshots(store, run_id=None):
+    """{source: body} of the newest snapshot per source, as of run_id (default: the latest run)"""
+    runs = store.manifests()
+    if run_id:
+        ids = [run["run_id"] for run in runs]
+        if run_id not in ids:
+            raise ValueError(f"no snapshot run {run_id!r} in {store.root}")
+        runs = runs[:ids.index(run_id) + 1]
+    feeds = {}
+    for run in reversed(runs):
+        for name, record in run["sources"].items():
+            sha256 = record.get("sha256")
+            if name in SOURCES and name not in feeds and sha256 and store.has(sha256):
+                with store.open(sha256) as f:
+                    feeds[name] = f.read()
+    return feeds
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))]
+
+def summarize(values):
+    """p50/p95/p99/max in milliseconds"""
+    if not values:
+        return {}
+    return {
+        "p50_ms": round(percentile(values, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1),
+    }
+
+def replay_env(server, data_dir, sources, rate_limit_scale, ack_timeout, ack_interval):
+    """Environment pointing every feed, Slack and JIRA call at the stand-in and every store at data_dir"""
+    env = dict(os.environ)
+    env.update({
+        "FEED_DATA_DIR": data_dir,
+        "SLACK_API_URL": f"{server.url}/api",
+        "SLACK_BOT_TOKEN": "xoxb-replay",
+        "SLACK_CHANNEL_ID": "C0REPLAY",
+        "JIRA_URL": server.url,
+        "JIRA_EMAIL": "replay@example.com",
+        "JIRA_API_TOKEN": "replay",
+        "JIRA_EPIC_KEY": f"{REPLAY_PROJECT}-0",
+        "JIRA_PROJECT_KEY": REPLAY_PROJECT,
+        "RATE_LIMIT_SCALE": str(rate_limit_scale),
+        "ACK_WATCH_TIMEOUT": str(ack_timeout),
+        "ACK_POLL_INTERVAL": str(ack_interval),
+        "PYTHONUNBUFFERED": "1",
+    })
+    for name in sources:
+        env[f"{name.upper()}_FEED_URL"] = f"{server.url}/feeds/{name}"
+    return env
+
+def run_script(args, env, log):
+    """Run one of the scripts, returning (seconds, exit code)"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + args, env=env, cwd=BASE_DIR, stdout=log, stderr=subprocess.STDOUT)
+    return time.perf_counter() - start, result.returncode
+
+def report(server, pipeline_start, pipeline_seconds, ack_seconds=None):
+    alerts = server.messages
+    replies = sum(len(m["replies"]) for m in server.messages)
+    endpoints = {}
+    for endpoint, status, seconds in server.calls:
+        endpoints.setdefault(endpoint, []).append((status, seconds))
+    api_calls = sum(len(calls) for endpoint, calls in endpoints.items() if endpoint != "feed")
+    result = {
+        "pipeline_seconds": round(pipeline_seconds, 3),
+        "alerts": len(alerts),
+        "thread_replies": replies,
+        "tickets": server.issues,
+        "api_calls": api_calls,
+        "alerts_per_second": round(len(alerts) / pipeline_seconds, 2) if pipeline_seconds else None,
+        "api_calls_per_second": round(api_calls / pipeline_seconds, 2) if pipeline_seconds else None,
+        "time_to_alert": summarize([m["posted_at"] - pipeline_start for m in alerts]),
+        "endpoints": {
+            endpoint: dict(
+                calls=len(calls),
+                errors=sum(1 for status, _ in calls if status >= 400),
+                **summarize([seconds for _, seconds in calls]),
+            )
+            for endpoint, calls in sorted(endpoints.items())
+        },
+    }
+    if ack_seconds is not None:
+        result["check_acknowledgments_seconds"] = round(ack_seconds, 3)
+    return result
+
+def print_report(result):
+    print(f"\n🏁 Pipeline finished in {result['pipeline_seconds']:.2f}s: {result['alerts']} alerts, {result['tickets']} tickets, {result['thread_replies']} thread replies")
+    print(f"   • {result['alerts_per_second']} alerts/s, {result['api_calls_per_second']} API calls/s")
+    if result["time_to_alert"]:
+        t = result["time_to_alert"]
+        print(f"   • Time to alert: p50 {t['p50_ms']:.0f} ms, p95 {t['p95_ms']:.0f} ms, p99 {t['p99_ms']:.0f} ms, max {t['max_ms']:.0f} ms")
+    if "check_acknowledgments_seconds" in result:
+        print(f"   • check_acknowledgments.py took {result['check_acknowledgments_seconds']:.2f}s")
+    print(f"\n{'Endpoint':<34}{'Calls':>7}{'Errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for endpoint, stats in result["endpoints"].items():
+        print(f"{endpoint:<34}{stats['calls']:>7}{stats['errors']:>8}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded feeds through the full pipeline against a local Slack/JIRA stand-in")
+    parser.add_argument("paths", nargs="*", help="RSS/Atom files to serve instead of snapshots (file names must start with the source name)")
+    parser.add_argument("--snapshots", default=SNAPSHOT_DIR, metavar="DIR", help="Snapshot store to replay from (default .snapshots)")
+    parser.add_argument("--run", help="Replay the feeds as of this snapshot run id (default: the latest run)")
+    parser.add_argument("--latency", type=float, default=50.0, metavar="MS", help="Fixed delay added to every API call (default 50)")
+    parser.add_argument("--jitter", type=float, default=25.0, metavar="MS", help="Mean of an exponential extra delay per API call (default 25)")
+    parser.add_argument("--error-rate", type=float, default=0.0, metavar="P", help="Fraction of API calls answered with a 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, metavar="P", help="Fraction of API calls answered with a 429 and Retry-After")
+    parser.add_argument("--ack-rate", type=float, default=1.0, metavar="P", help="Fraction of alerts that get a thumbs up (default 1)")
+    parser.add_argument("--ack-timeout", type=int, default=10, metavar="S", help="Seconds each alert is watched for a thumbs up (default 10)")
+    parser.add_argument("--ack-interval", type=float, default=1.0, metavar="S", help="Reaction polling interval in seconds (default 1)")
+    parser.add_argument("--rate-limit-scale", type=float, default=1.0, help="Multiplier on the client-side Slack/JIRA rate limits; 0 disables them")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for injected latency, faults and thumbs ups")
+    parser.add_argument("--stream", action="store_true", help="Run the pipeline in streaming mode")
+    parser.add_argument("--check-acks", action="store_true", help="Also run check_acknowledgments.py against the stand-in afterwards")
+    parser.add_argument("--data-dir", help="Keep the replay's stores, output feeds and log here (default: a temp dir, deleted afterwards)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show the pipeline's output instead of logging it")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.paths:
+        feeds = {}
+        for path in args.paths:
+            name = source_for_file(path)
+            if name is None:
+                parser.error(f"no source matches the file name {path}")
+            feeds[name] = read_feed_file(path)
+    else:
+        try:
+            feeds = load_snapshots(SnapshotStore(args.snapshots), args.run)
+        except ValueError as e:
+            parser.error(str(e))
+    if not feeds:
+        parser.error(f"nothing to replay: no snapshots in {args.snapshots} - run the feed filters first or pass feed files")
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="feed-replay-")
+    os.makedirs(data_dir, exist_ok=True)
+    if os.path.exists(CVE_INDEX_FILE) and not os.path.exists(os.path.join(data_dir, ".cve_index.db")):
+        shutil.copy(CVE_INDEX_FILE, data_dir)
+
+    server = FakeServices(
+        feeds, args.latency / 1000, args.jitter / 1000, args.error_rate, args.throttle_rate, args.ack_rate, args.seed,
+    )
+    threading.Thread(target=server.serve_forever, name="replay-server", daemon=True).start()
+    env = replay_env(server, data_dir, feeds, args.rate_limit_scale, args.ack_timeout, args.ack_interval)
+    print(f"🎬 Replaying {', '.join(sorted(feeds))} against stand-in at {server.url} (data in {data_dir})")
+
+    log_path = os.path.join(data_dir, "replay.log")
+    with open(log_path, "w") as log:
+        output = None if args.verbose else log
+        command = ["run_feeds.py", *sorted(feeds), "--no-snapshots"] + (["--stream"] if args.stream else [])
+        pipeline_start = time.time()
+        pipeline_seconds, code = run_script(command, env, output)
+        if code:
+            print(f"❌ run_feeds.py exited with status {code} - see {log_path}")
+        ack_seconds = None
+        if args.check_acks:
+            ack_seconds, code = run_script(["check_acknowledgments.py"], env, output)
+            if code:
+                print(f"❌ check_acknowledgments.py exited with status {code} - see {log_path}")
+    server.shutdown()
+    server.server_close()
+
+    result = report(server, pipeline_start, pipeline_seconds, ack_seconds)
+    print_report(result)
+    if args.json_path:
+        result["config"] = {key: value for key, value in vars(args).items() if key not in ("json_path", "verbose")}
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Wrote results to {args.json_path}")
+    if not args.data_dir:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,704 @@
+import os, json
+from xml.etree.ElementTree import ParseError
+from datetime import datetime
+import math
+import calendar
+from concurrent.futures import ThreadPoolExecutor
+from ack_watcher import AcknowledgmentWatcher
+from keywords import PRODUCT_KEYWORDS, THREAT_KEYWORDS, OTHER_KEYWORDS
+from keyword_matcher import KeywordMatcher, is_alert, match_entry, strip_html_tags
+from feed_sources import OUTPUT_DIR
+from seen_store import entry_key
+from http_client import build_session, slack_session, jira_session
+from feed_stream import download_feed, element_to_entry, item_link, iter_entries
+from feed_writer import write_feed
+from user_cache import UserCache
+from transition_cache import TransitionCache
+from cve_index import CveIndex
+from severity import NotificationQueue, score_alert
+try:
+    from zoneinfo import ZoneInfo
+    TZ = ZoneInfo("America/New_York")
+except ImportError:
+    TZ = None
+
+# JIRA Configuration with error handling
+try:
+    JIRA_URL = os.environ["JIRA_URL"]
+    JIRA_EMAIL = os.environ["JIRA_EMAIL"]
+    JIRA_API_TOKEN = os.environ["JIRA_API_TOKEN"]
+    JIRA_EPIC_KEY = os.environ["JIRA_EPIC_KEY"]
+    JIRA_PROJECT_KEY = os.environ["JIRA_PROJECT_KEY"]
+    print(f"✅ JIRA configuration loaded - URL: {JIRA_URL}, Email: {JIRA_EMAIL}, Epic: {JIRA_EPIC_KEY}, Project: {JIRA_PROJECT_KEY}")
+except KeyError as e:
+    print(f"❌ Missing JIRA environment variable: {e}")
+    JIRA_URL = JIRA_EMAIL = JIRA_API_TOKEN = JIRA_EPIC_KEY = JIRA_PROJECT_KEY = None
+
+SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
+SLACK_CHANNEL_ID = os.environ.get("SLACK_CHANNEL_ID")
+SLACK_API_URL = os.environ.get("SLACK_API_URL", "https://slack.com/api")
+
+if SLACK_BOT_TOKEN and SLACK_CHANNEL_ID:
+    print(f"✅ Slack configuration loaded - Channel: {SLACK_CHANNEL_ID}")
+else:
+    print(f"⚠️ Slack configuration incomplete - Token: {'✅' if SLACK_BOT_TOKEN else '❌'}, Channel: {'✅' if SLACK_CHANNEL_ID else '❌'}")
+
+# Maximum issues per request to JIRA's bulk create endpoint
+JIRA_BULK_LIMIT = 50
+
+# Worker threads creating tickets for new alerts
+NOTIFY_WORKERS = int(os.environ.get("NOTIFY_WORKERS", "4"))
+
+# Streaming mode stops matching after this many consecutive entries from the previous fetch
+STREAM_SEEN_RUN = int(os.environ.get("STREAM_SEEN_RUN", "3"))
+
+# How long each posted alert is watched for a thumbs up, and how often reactions are polled
+ACK_WATCH_TIMEOUT = int(os.environ.get("ACK_WATCH_TIMEOUT", "60"))
+ACK_POLL_INTERVAL = float(os.environ.get("ACK_POLL_INTERVAL", "5"))
+
+# Newest links remembered per source so the next streaming run knows where to stop
+RECENT_LINKS_KEPT = 50
+
+# Plain pooled session with retries for downloading feeds in streaming mode
+feed_http = build_session()
+
+# One pooled keep-alive session per API host, shared by every helper below
+slack_http = slack_session(SLACK_BOT_TOKEN)
+jira_http = jira_session(JIRA_EMAIL, JIRA_API_TOKEN)
+
+# Slack user -> email -> JIRA accountId lookups shared across runs
+user_cache = UserCache()
+
+# "In Progress" transition IDs resolved per project and issue type
+transition_cache = TransitionCache()
+
+# CVSS and CISA KEV details from the offline snapshot index
+cve_index = CveIndex()
+
+def load_feed_state(source):
+    """Load the validators and recent links saved from the last fetch of a source"""
+    if os.path.exists(source["state_file"]):
+        with open(source["state_file"], "r") as f:
+            return json.load(f)
+    return {}
+
+def save_feed_state(source, parsed, recent_links=None):
+    """Persist the ETag/Last-Modified validators, body hash and newest links of a fetched feed"""
+    state = {
+        "etag": parsed.get("etag"),
+        "modified": parsed.get("modified"),
+        "sha256": parsed.get("sha256"),
+        "recent_links": (recent_links or [])[:RECENT_LINKS_KEPT],
+    }
+    if not any(state.values()):
+        return
+    with open(source["state_file"], "w") as f:
+        json.dump(state, f)
+
+def is_not_modified(parsed):
+    """True when a fetch brought nothing new: 304 Not Modified, or the same body as last run"""
+    return parsed.get("status") == 304 or parsed.get("unchanged", False)
+
+def fetch_feed(source, stream=False, snapshots=None, refilter=False):
+    """Fetch the upstream RSS feed for a source, sending saved validators.
+
+    The raw body is hashed while it downloads and, given a SnapshotStore,
+    kept as a snapshot. A body identical to the last processed one is
+    marked unchanged and not parsed at all. refilter=True ignores the saved
+    validators and hash so the feed is always downloaded and matched again.
+    With stream=True the body is parsed lazily by filter_stream(); otherwise
+    feedparser parses the whole document here.
+    """
+    state = {} if refilter else load_feed_state(source)
+    print(f"🌐 [{source['name']}] Fetching RSS feed from: {source['feed_url']}")
+    feed = download_feed(feed_http, source["feed_url"], state.get("etag"), state.get("modified"))
+    if feed.get("status") == 304:
+        print(f"💤 [{source['name']}] Feed not modified since last fetch (304) - skipping")
+        return feed
+    if snapshots is not None and snapshots.put(feed.body, feed["sha256"]):
+        print(f"📸 [{source['name']}] Stored snapshot {feed['sha256'][:12]}")
+    if feed["sha256"] == state.get("sha256"):
+        print(f"💤 [{source['name']}] Feed body unchanged since last run (sha256 {feed['sha256'][:12]}) - skipping")
+        feed["unchanged"] = True
+        feed.close()
+        return feed
+    print(f"📰 [{source['name']}] Downloaded {feed['bytes'] // 1024} KB RSS feed")
+    if stream:
+        return feed
+    parsed = feed.to_feedparser()
+    feed.close()
+    print(f"📰 [{source['name']}] Found {len(parsed.entries)} total entries in RSS feed")
+    return parsed
+
+# Keyword lists compiled once into a single multi-pattern automaton
+KEYWORD_MATCHER = KeywordMatcher({
+    "products": PRODUCT_KEYWORDS,
+    "threats": THREAT_KEYWORDS,
+    "others": OTHER_KEYWORDS,
+})
+
+def index_entry(entry_index, source, entry, match=None):
+    """Add a fetched entry to the full-text index, reusing its stripped text when already matched"""
+    if entry_index is None:
+        return
+    text = match["clean_description"] if match else strip_html_tags(getattr(entry, 'description', ''))
+    entry_index.add(source["name"], entry, text)
+
+def filter_entries(source, parsed, seen_store, entry_index=None):
+    """Return (all matching entries, new (source, entry, match) items) for a parsed feed.
+
+    Every entry, matched or not, is also added to entry_index when given.
+    """
+    exclude = source.get("exclude")
+    matched = []
+    new_entries = []
+    new_keys = set()
+
+    print(f"🔍 [{source['name']}] Checking {len(parsed.entries)} entries for matches...")
+
+    for entry in parsed.entries:
+        if exclude and exclude(entry):
+            index_entry(entry_index, source, entry)
+            continue
+        match = match_entry(entry, KEYWORD_MATCHER)
+        index_entry(entry_index, source, entry, match)
+        if not is_alert(match):
+            continue
+
+        print(f"✅ Found matching entry: {str(getattr(entry, 'title', ''))[:50]}...")
+        key = entry_key(entry)
+        if key and key not in seen_store and key not in new_keys:
+            new_entries.append((source, entry, match))
+            new_keys.add(key)
+            print(f"🆕 New entry - will create ticket and send notification")
+        else:
+            print(f"📋 Entry already seen - skipping notification")
+        matched.append(entry)
+
+    print(f"📊 [{source['name']}] Summary: {len(new_entries)} new entries to process")
+    return matched, new_entries
+
+def filter_stream(source, feed, seen_store, recent_links=(), entry_index=None):
+    """Streaming counterpart of filter_entries for a feed fetched with stream=True.
+
+    Entries are parsed and matched one at a time, newest first, until
+    STREAM_SEEN_RUN consecutive entries were already in the previous fetch.
+    Everything after that run is older still and was filtered last time, so
+    only its links are read (and it was already added to entry_index).
+    Returns (matching entries, new items, every link in feed order, links of
+    the unmatched tail).
+    """
+    exclude = source.get("exclude")
+    recent = set(recent_links)
+    matched = []
+    new_entries = []
+    new_keys = set()
+    links = []
+    tail = set()
+    seen_run = 0
+
+    print(f"🔍 [{source['name']}] Streaming entries for matches...")
+
+    for item in feed.iter_items():
+        if seen_run >= STREAM_SEEN_RUN:
+            link = item_link(item)
+            links.append(link)
+            tail.add(link)
+            continue
+
+        entry = element_to_entry(item)
+        key = entry_key(entry)
+        links.append(key)
+        seen_run = seen_run + 1 if key in recent else 0
+        if exclude and exclude(entry):
+            index_entry(entry_index, source, entry)
+            continue
+        match = match_entry(entry, KEYWORD_MATCHER)
+        index_entry(entry_index, source, entry, match)
+        if not is_alert(match):
+            continue
+
+        print(f"✅ Found matching entry: {str(getattr(entry, 'title', ''))[:50]}...")
+        if key and key not in seen_store and key not in new_keys:
+            new_entries.append((source, entry, match))
+            new_keys.add(key)
+            print(f"🆕 New entry - will create ticket and send notification")
+        else:
+            print(f"📋 Entry already seen - skipping notification")
+        matched.append(entry)
+
+    if tail:
+        print(f"⏭️ [{source['name']}] Stopped matching after {len(links) - len(tail)} of {len(links)} entries - the rest were seen last run")
+    print(f"📊 [{source['name']}] Summary: {len(new_entries)} new entries to process")
+    return matched, new_entries, links, tail
+
+def read_output_feed(source):
+    """Entries of the existing output feed, or None if there is none or it can't be read"""
+    output_path = os.path.join(OUTPUT_DIR, source["output_file"])
+    if not os.path.exists(output_path):
+        return None
+    with open(output_path, "rb") as f:
+        try:
+            return list(iter_entries(f))
+        except ParseError as e:
+            print(f"⚠️ [{source['name']}] Could not read previous output feed {output_path}: {e}")
+            return None
+
+def seed_archive(source, archive):
+    """One-time import of an existing output feed into a source's archive that was never built"""
+    if archive.is_built(source["name"]):
+        return 0
+    entries = read_output_feed(source)
+    if entries is None:
+        return 0
+    added = archive.add(source["name"], entries)
+    archive.mark_built(source["name"])
+    return added
+
+def write_output_feed(source, entries, archive):
+    """Merge matching entries into the source's rolling archive and rewrite its feed if that changed"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output_path = os.path.join(OUTPUT_DIR, source["output_file"])
+    channel = (source["channel_title"], source["feed_url"], source["channel_description"])
+
+    added = archive.add(source["name"], entries)
+    archive.mark_built(source["name"])
+    pruned = archive.prune(source["name"])
+    if added or pruned:
+        print(f"🗄️ [{source['name']}] Archive: {added} added, {pruned} expired")
+    if write_feed(output_path, channel, archive.items(source["name"]), archive.digest(source["name"], channel)):
+        print(f"💾 [{source['name']}] Wrote {archive.count(source['name'])} archived entries to {source['output_file']}")
+    else:
+        print(f"💤 [{source['name']}] {source['output_file']} unchanged - not rewritten")
+
+def get_reactions(ts):
+    url = f"{SLACK_API_URL}/reactions.get"
+    params = {
+        "channel": SLACK_CHANNEL_ID,
+        "timestamp": ts
+    }
+    resp = slack_http.get(url, params=params)
+    return resp.json().get("message", {}).get("reactions", [])
+
+def get_user_info(user_id):
+    url = f"{SLACK_API_URL}/users.info"
+    params = {"user": user_id}
+    resp = slack_http.get(url, params=params)
+    return resp.json().get("user", {})
+
+def get_jira_account_id(email):
+    url = f"{JIRA_URL}/rest/api/3/user/search"
+    params = {"query": email}
+    resp = jira_http.get(url, params=params)
+    resp.raise_for_status()
+    users = resp.json()
+    if users and isinstance(users, list):
+        return users[0].get("accountId")
+    return None
+
+def assign_jira_ticket(ticket_key, slack_email, slack_username):
+    account_id = user_cache.jira_account_id(slack_email, get_jira_account_id) if slack_email else None
+    if not account_id:
+        print(f"❌ Could not find JIRA accountId for {slack_email or slack_username}")
+        return
+    data = {"accountId": account_id}
+    resp = jira_http.put(f"{JIRA_URL}/rest/api/3/issue/{ticket_key}/assignee", json=data)
+    if resp.status_code == 204:
+        print(f"✅ Assigned JIRA ticket {ticket_key} to accountId {account_id}")
+    else:
+        print(f"❌ Failed to assign JIRA ticket: {resp.text}")
+
+def post_thread_reply(ts, text):
+    url = f"{SLACK_API_URL}/chat.postMessage"
+    data = {
+        "channel": SLACK_CHANNEL_ID,
+        "thread_ts": ts,
+        "text": text
+    }
+    resp = slack_http.post(url, json=data)
+    return resp.json()
+
+def resolve_transition_id(url, transition_name):
+    resp = jira_http.get(url)
+    transitions = resp.json().get("transitions", [])
+    for t in transitions:
+        if t["name"].lower() == transition_name:
+            return t["id"]
+    return None
+
+def transition_jira_ticket_in_progress(ticket_key):
+    url = f"{JIRA_URL}/rest/api/3/issue/{ticket_key}/transitions"
+    cache_key = TransitionCache.key(ticket_key, "in progress")
+    in_progress_id = transition_cache.get(cache_key)
+    from_cache = in_progress_id is not None
+    while True:
+        if not in_progress_id:
+            in_progress_id = resolve_transition_id(url, "in progress")
+            if not in_progress_id:
+                print("❌ Could not find 'In Progress' transition for this ticket.")
+                return
+            transition_cache.put(cache_key, in_progress_id)
+        data = {"transition": {"id": in_progress_id}}
+        resp = jira_http.post(url, json=data)
+        if resp.status_code == 400 and from_cache:
+            # Workflow changed since the ID was cached: re-resolve once and retry
+            print(f"♻️ Cached 'In Progress' transition {in_progress_id} was rejected, re-resolving...")
+            transition_cache.invalidate(cache_key)
+            in_progress_id = None
+            from_cache = False
+            continue
+        break
+    if resp.status_code == 204:
+        print(f"✅ Transitioned JIRA ticket {ticket_key} to 'In Progress'")
+    else:
+        print(f"❌ Failed to transition JIRA ticket: {resp.text}")
+
+def set_triage_started_field(ticket_key):
+    field_id = "customfield_10684"
+    if TZ:
+        now_iso = datetime.now(TZ).isoformat()
+    else:
+        now_iso = datetime.utcnow().isoformat() + 'Z'
+    data = {
+        "fields": {
+            field_id: now_iso
+        }
+    }
+    resp = jira_http.put(f"{JIRA_URL}/rest/api/3/issue/{ticket_key}", json=data)
+    print(f"[DEBUG] Set triage started field: {resp.status_code} {resp.text}")
+
+def acknowledge_alert(ts, ticket_key, first_user):
+    user = user_cache.slack_user(first_user, get_user_info)
+    slack_username = user["name"]
+    slack_email = user["email"]
+    print(f"👍 Thumbs up detected from {slack_username} ({slack_email})! Posting acknowledgment in thread and locking assignment...")
+    post_thread_reply(ts, f"Under review and acknowledged by <@{first_user}> :white_check_mark:")
+    assign_jira_ticket(ticket_key, slack_email, slack_username)
+    set_triage_started_field(ticket_key)
+    transition_jira_ticket_in_progress(ticket_key)
+
+ack_watcher = AcknowledgmentWatcher(get_reactions, acknowledge_alert, timeout=ACK_WATCH_TIMEOUT, interval=ACK_POLL_INTERVAL)
+
+def enrich_cves(match):
+    """Attach CVSS score and KEV status from the CVE index to a match's extracted CVEs"""
+    match["cve_details"] = cve_index.lookup(match["cves"])
+    return match
+
+def describe_cve(cve, details):
+    """One-line CVE summary, e.g. "CVE-2024-57727 (CVSS 7.5 HIGH, CISA KEV since 2025-02-13)" """
+    if not details:
+        return cve
+    parts = []
+    if details["cvss"] is not None:
+        parts.append(f"CVSS {details['cvss']:g}" + (f" {details['severity']}" if details["severity"] else ""))
+    if details["kev"]:
+        kev = "CISA KEV" + (f" since {details['kev_date_added']}" if details["kev_date_added"] else "")
+        if details["ransomware"] == "Known":
+            kev += ", used by ransomware"
+        parts.append(kev)
+    return f"{cve} ({', '.join(parts)})" if parts else cve
+
+def format_cves(match):
+    details = match.get("cve_details", {})
+    return ", ".join(describe_cve(cve, details.get(cve)) for cve in match["cves"])
+
+def format_keywords(match):
+    return ", ".join(match["products"] + match["threats"] + match["others"])
+
+def post_to_slack(source, entry, match, ticket_key=None):
+    if not SLACK_BOT_TOKEN or not SLACK_CHANNEL_ID:
+        return None
+    message_parts = []
+    message_parts.append(source["slack_prefix"])
+    message_parts.append(f"Title: {getattr(entry, 'title', '')}")
+    keywords = format_keywords(match)
+    if keywords:
+        message_parts.append(f"Keywords: {keywords}")
+    if match["cves"]:
+        message_parts.append(f"CVEs: {format_cves(match)}")
+    if "score" in match:
+        message_parts.append(f"Severity: {match['priority']} (score {match['score']:.1f})")
+    if ticket_key:
+        jira_url = f"{JIRA_URL}/browse/{ticket_key}"
+        message_parts.append(f"JIRA Ticket: <{jira_url}|{ticket_key}>")
+    text = "\n".join(message_parts)
+    msg = {
+        "channel": SLACK_CHANNEL_ID,
+        "text": text
+    }
+    resp = slack_http.post(f"{SLACK_API_URL}/chat.postMessage", json=msg)
+    ts = resp.json().get("ts")
+    if ts and ticket_key:
+        ack_watcher.watch(ts, ticket_key)
+    return ts
+
+def vulnerability_section(match):
+    """ADF nodes listing an entry's CVEs with their CVSS and KEV details, or nothing without CVEs"""
+    if not match["cves"]:
+        return []
+    details = match.get("cve_details", {})
+    lines = []
+    for cve in match["cves"]:
+        if lines:
+            lines.append({"type": "hardBreak"})
+        lines.append({"type": "text", "text": describe_cve(cve, details.get(cve))})
+    return [
+        {"type": "heading", "attrs": {"level": 3}, "content": [{"type": "text", "text": "Vulnerabilities"}]},
+        {"type": "paragraph", "content": lines},
+    ]
+
+def build_issue_data(source, entry, match):
+    """Build the JIRA create-issue payload for a matched entry"""
+    title = str(getattr(entry, 'title', '')).strip()
+    if len(title) > 255:
+        title = title[:252] + "..."
+    clean_description = match["clean_description"]
+
+    # Create a proper summary by truncating to reasonable length
+    summary_text = clean_description.strip()
+    if len(summary_text) > 500:
+        # Truncate to 500 characters and try to end at a sentence boundary
+        truncated = summary_text[:500]
+        last_period = truncated.rfind('.')
+        last_exclamation = truncated.rfind('!')
+        last_question = truncated.rfind('?')
+
+        # Find the last sentence ending
+        last_sentence_end = max(last_period, last_exclamation, last_question)
+        if last_sentence_end > 400:  # Only use sentence boundary if it's not too early
+            summary_text = truncated[:last_sentence_end + 1]
+        else:
+            summary_text = truncated + "..."
+
+    description = {
+        "version": 1,
+        "type": "doc",
+        "content": [
+            {"type": "heading", "attrs": {"level": 2}, "content": [{"type": "text", "text": "Security Alert Details"}]},
+            {"type": "paragraph", "content": [
+                {"type": "text", "text": f"Source: {source['jira_source']}"},
+                {"type": "hardBreak"},
+                {"type": "text", "text": f"Published: {getattr(entry, 'published', '')}"},
+                {"type": "hardBreak"},
+                {"type": "text", "text": f"Link: {getattr(entry, 'link', '')}"}
+            ]},
+            {"type": "heading", "attrs": {"level": 3}, "content": [{"type": "text", "text": "Summary"}]},
+            {"type": "paragraph", "content": [{"type": "text", "text": summary_text}]},
+            {"type": "heading", "attrs": {"level": 3}, "content": [{"type": "text", "text": "Keywords Detected"}]},
+            {"type": "paragraph", "content": [
+                {"type": "text", "text": "Products: "},
+                {"type": "text", "text": ", ".join(match["products"])}
+            ]},
+            {"type": "paragraph", "content": [
+                {"type": "text", "text": "Threats: "},
+                {"type": "text", "text": ", ".join(match["threats"])}
+            ]},
+            {"type": "paragraph", "content": [
+                {"type": "text", "text": "Customers: "},
+                {"type": "text", "text": ", ".join(match["others"])}
+            ]},
+            *vulnerability_section(match),
+            {"type": "heading", "attrs": {"level": 3}, "content": [{"type": "text", "text": "Action Required"}]},
+            {"type": "paragraph", "content": [{"type": "text", "text": "Please review this security alert and determine if any action is required for our environment."}]},
+            {"type": "paragraph", "content": [
+                {"type": "text", "text": "---"},
+                {"type": "hardBreak"},
+                {"type": "text", "text": f"This ticket was automatically created by the RSS filter script on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"}
+            ]}
+        ]
+    }
+    issue_data = {
+        "fields": {
+            "project": {"key": JIRA_PROJECT_KEY},
+            "summary": title,
+            "description": description,
+            "issuetype": {"name": "Sub-task"},
+            "parent": {"key": JIRA_EPIC_KEY},
+            "priority": {"name": match.get("priority", "Medium")}
+        }
+    }
+    return issue_data
+
+def jira_configured():
+    if not all([JIRA_URL, JIRA_EMAIL, JIRA_API_TOKEN, JIRA_EPIC_KEY]):
+        print("JIRA configuration incomplete. Skipping ticket creation.")
+        return False
+    return True
+
+def create_jira_ticket(source, entry, match):
+    if not jira_configured():
+        return None
+    issue_data = build_issue_data(source, entry, match)
+    try:
+        response = jira_http.post(f"{JIRA_URL}/rest/api/3/issue", json=issue_data)
+        if response.status_code == 201:
+            issue_key = response.json().get("key")
+            print(f"✅ Created JIRA ticket: {issue_key}")
+            return issue_key
+        else:
+            print(f"❌ Failed to create JIRA ticket. Status: {response.status_code}")
+            print(f"Response: {response.text}")
+            return None
+    except Exception as e:
+        print(f"❌ Error creating JIRA ticket: {str(e)}")
+        return None
+
+def create_jira_tickets_bulk(items):
+    """Create tickets for (source, entry, match) items via the bulk endpoint.
+
+    Returns one ticket key (or None) per item, in order. Items are sent in
+    batches of JIRA_BULK_LIMIT and a failed item only affects itself.
+    """
+    ticket_keys = [None] * len(items)
+    if not jira_configured():
+        return ticket_keys
+    for start in range(0, len(items), JIRA_BULK_LIMIT):
+        batch = items[start:start + JIRA_BULK_LIMIT]
+        payload = {"issueUpdates": [build_issue_data(source, entry, match) for source, entry, match in batch]}
+        try:
+            response = jira_http.post(f"{JIRA_URL}/rest/api/3/issue/bulk", json=payload)
+            result = response.json()
+        except Exception as e:
+            print(f"❌ Error creating {len(batch)} JIRA tickets in bulk: {str(e)}")
+            continue
+        if response.status_code not in (200, 201, 400) or not isinstance(result, dict):
+            print(f"❌ Failed to create JIRA tickets in bulk. Status: {response.status_code}")
+            print(f"Response: {response.text}")
+            continue
+
+        # Created issues come back in request order, skipping the elements that failed
+        errors = {error.get("failedElementNumber"): error for error in result.get("errors", [])}
+        created = iter(result.get("issues", []))
+        for offset, (source, entry, match) in enumerate(batch):
+            title = str(getattr(entry, 'title', ''))[:50]
+            if offset in errors:
+                print(f"❌ Failed to create JIRA ticket for '{title}': {errors[offset].get('elementErrors')}")
+                continue
+            issue = next(created, None)
+            if issue:
+                ticket_keys[start + offset] = issue.get("key")
+                print(f"✅ Created JIRA ticket: {issue.get('key')}")
+    return ticket_keys
+
+def create_jira_tickets(items):
+    """Create tickets for a batch of items, returning one ticket key (or None) per item"""
+    try:
+        if len(items) == 1:
+            return [create_jira_ticket(*items[0])]
+        return create_jira_tickets_bulk(items)
+    except Exception as e:
+        print(f"❌ Error creating JIRA tickets: {str(e)}")
+        return [None] * len(items)
+
+def published_time(entry):
+    """An entry's pubDate in epoch seconds, or None if it has none"""
+    published = getattr(entry, 'published_parsed', None)
+    return calendar.timegm(published) if published else None
+
+def published_sort_key(item):
+    """Sort key placing items oldest pubDate first, undated items last"""
+    published = published_time(item[1])
+    return published if published is not None else float("inf")
+
+def add_jira_source_link(ticket_key, source, entry):
+    """Attach another source's article to an existing ticket as a remote link"""
+    link = {
+        "object": {
+            "url": str(getattr(entry, 'link', '')),
+            "title": f"{source['jira_source']}: {str(getattr(entry, 'title', ''))}"[:255],
+        }
+    }
+    try:
+        response = jira_http.post(f"{JIRA_URL}/rest/api/3/issue/{ticket_key}/remotelink", json=link)
+        if response.status_code in (200, 201):
+            print(f"🔗 Linked {source['name']} article to {ticket_key}")
+        else:
+            print(f"❌ Failed to link {source['name']} article to {ticket_key}. Status: {response.status_code}")
+    except Exception as e:
+        print(f"❌ Error linking {source['name']} article to {ticket_key}: {str(e)}")
+
+def raise_jira_priority(ticket_key, priority):
+    """Set an existing ticket's priority, returning True on success"""
+    data = {"fields": {"priority": {"name": priority}}}
+    try:
+        response = jira_http.put(f"{JIRA_URL}/rest/api/3/issue/{ticket_key}", json=data)
+    except Exception as e:
+        print(f"❌ Error raising {ticket_key} to {priority}: {str(e)}")
+        return False
+    if response.status_code == 204:
+        print(f"⬆️ Raised JIRA ticket {ticket_key} to {priority}")
+        return True
+    print(f"❌ Failed to raise {ticket_key} to {priority}. Status: {response.status_code}")
+    return False
+
+def attach_duplicate(story, source, entry, match):
+    """Point an existing story's ticket and Slack alert at a near-duplicate entry.
+
+    A duplicate that scores into a higher priority than the story raises the
+    story's ticket to that priority. Returns True when it did.
+    """
+    title = str(getattr(entry, 'title', ''))
+    print(f"🔁 [{source['name']}] '{title[:50]}' duplicates {story['source']} story '{story['title'][:50]}'")
+    raised = (
+        story["score"] is not None and match["score"] > story["score"] and match["priority"] != story["priority"]
+    )
+    if story["ticket_key"] and jira_configured():
+        add_jira_source_link(story["ticket_key"], source, entry)
+        if raised:
+            raised = raise_jira_priority(story["ticket_key"], match["priority"])
+    if story["slack_ts"] and SLACK_BOT_TOKEN and SLACK_CHANNEL_ID:
+        text = f"🔁 Also reported by {source['slack_prefix']}: <{getattr(entry, 'link', '')}|{title}>"
+        if raised:
+            text += f"\n⬆️ Priority raised from {story['priority']} to {match['priority']} (score {match['score']:.1f})"
+        post_thread_reply(story["slack_ts"], text)
+    return raised
+
+def process_and_notify(items, seen_store, dedup_index):
+    """Create tickets for new (source, entry, match) items, then alert Slack and record them as seen.
+
+    Items are first enriched from the CVE index, scored and checked against
+    the cross-source dedup index: one that matches another source's story
+    published around the same time (by CVE ID or near-identical title) is linked to that story's ticket and Slack
+    thread instead of getting its own. The rest are drained from a priority
+    queue, highest severity first, into batches created on a worker pool
+    (JIRA concurrency is also capped by its session). Slack alerts go out in
+    that order, each one as soon as its own batch's tickets exist, while
+    later batches are still in flight.
+    """
+    items = sorted(items, key=published_sort_key)
+    queue = NotificationQueue()
+    duplicates = []
+    for item in items:
+        source, entry, match = item
+        enrich_cves(match)
+        score_alert(source, match)
+        title = str(getattr(entry, 'title', ''))
+        signature = dedup_index.signature(title)
+        published = published_time(entry)
+        story = dedup_index.find(signature, match["cves"], source["name"], published)
+        if story:
+            duplicates.append((item, story["id"]))
+        else:
+            story_id = dedup_index.add(
+                source["name"], entry_key(entry) or '', title, signature, match["cves"], published, match["score"], match["priority"]
+            )
+            queue.push(item, story_id)
+
+    batch_size = max(1, min(JIRA_BULK_LIMIT, math.ceil(len(queue) / NOTIFY_WORKERS)))
+    batches = []
+    while queue:
+        batches.append(queue.pop_batch(batch_size))
+    with ThreadPoolExecutor(max_workers=max(1, min(NOTIFY_WORKERS, len(batches)))) as pool:
+        futures = [pool.submit(create_jira_tickets, [item for item, story_id in batch]) for batch in batches]
+        for batch, future in zip(batches, futures):
+            for ((source, entry, match), story_id), ticket_key in zip(batch, future.result()):
+                ts = post_to_slack(source, entry, match, ticket_key)
+                dedup_index.update(story_id, ticket_key, ts)
+                seen_store.add(entry_key(entry), source["name"], ticket_key)
+
+    # Duplicates are handled last so stories first seen in this run already have their ticket
+    for (source, entry, match), story_id in duplicates:
+        story = dedup_index.get(story_id)
+        if attach_duplicate(story, source, entry, match):
+            dedup_index.update(story_id, score=match["score"], priority=match["priority"])
+        seen_store.add(entry_key(entry), source["name"], story["ticket_key"])
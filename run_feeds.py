@@ -0,0 +1,181 @@
+import argparse
+import os
+import time
+from xml.etree.ElementTree import ParseError
+from concurrent.futures import ThreadPoolExecutor
+
+from feed_sources import SOURCES
+from seen_store import SeenStore, entry_key
+from feed_archive import FeedArchive
+from dedup_index import DedupIndex
+from entry_index import EntryIndex
+from snapshot_store import SnapshotStore, new_run
+import rss_common
+
+# Upper bound on concurrent feed downloads
+MAX_FETCH_WORKERS = 5
+
+# Parse feeds incrementally by default when FEED_STREAM_PARSE=1
+STREAM_PARSE = os.environ.get("FEED_STREAM_PARSE") == "1"
+
+# Re-match every entry of every feed, even unchanged ones, when FEED_REFILTER=1
+REFILTER = os.environ.get("FEED_REFILTER") == "1"
+
+def fetch_all(sources, max_workers=MAX_FETCH_WORKERS, stream=False, snapshots=None, refilter=False):
+    """Fetch every source in parallel, returning {name: parsed or streamed feed}"""
+    parsed_feeds = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources)))) as pool:
+        futures = {source["name"]: pool.submit(rss_common.fetch_feed, source, stream, snapshots, refilter) for source in sources}
+        for name, future in futures.items():
+            try:
+                parsed_feeds[name] = future.result()
+            except Exception as e:
+                print(f"❌ [{name}] Error fetching RSS feed: {str(e)}")
+    return parsed_feeds
+
+def run_source(source, parsed, seen_store, archive, entry_index, stream=False):
+    """Filter one feed and update its output, returning (new items to notify on, links in feed order)"""
+    imported = seen_store.import_legacy_cache(source["name"], source.get("legacy_cache_file"))
+    if imported:
+        print(f"📋 [{source['name']}] Imported {imported} previously seen entries from {source['legacy_cache_file']}")
+    seeded = rss_common.seed_archive(source, archive)
+    if seeded:
+        print(f"🗄️ [{source['name']}] Seeded archive with {seeded} entries from {source['output_file']}")
+
+    if stream:
+        feed = parsed
+        try:
+            result = run_stream(source, feed, seen_store, archive, entry_index)
+        except ParseError as e:
+            print(f"⚠️ [{source['name']}] Streaming parse failed ({e}) - falling back to feedparser")
+            result = None
+        if result is None:
+            parsed = feed.to_feedparser()
+        feed.close()
+        if result is not None:
+            return result
+
+    matched, new_entries = rss_common.filter_entries(source, parsed, seen_store, entry_index)
+    entry_index.flush()
+    rss_common.write_output_feed(source, matched, archive)
+    return new_entries, [entry_key(entry) for entry in parsed.entries]
+
+def run_stream(source, feed, seen_store, archive, entry_index):
+    """Streaming run_source: match only the entries newer than the last fetch.
+
+    Matches among the older tail are already in the source's archive.
+    Returns None when the archive has never been built, so the whole feed
+    must be filtered to build it. An archive that was built but holds no
+    items is fine: the tail had no matches either.
+    """
+    recent_links = rss_common.load_feed_state(source).get("recent_links", [])
+    matched, new_entries, links, tail = rss_common.filter_stream(source, feed, seen_store, recent_links, entry_index)
+    entry_index.flush()
+    if tail and not archive.is_built(source["name"]):
+        print(f"⚠️ [{source['name']}] Archive has never been built - re-filtering the whole feed")
+        return None
+    rss_common.write_output_feed(source, matched, archive)
+    return new_entries, links
+
+def snapshot_record(source, parsed):
+    """Manifest entry describing what a source's fetch returned"""
+    if parsed is None:
+        return {"url": source["feed_url"], "status": None}
+    return {
+        "url": source["feed_url"],
+        "status": parsed.get("status"),
+        "etag": parsed.get("etag"),
+        "modified": parsed.get("modified"),
+        "sha256": parsed.get("sha256"),
+        "bytes": parsed.get("bytes"),
+        "unchanged": parsed.get("unchanged", False),
+    }
+
+def main(source_names=None):
+    parser = argparse.ArgumentParser(description="Filter security RSS feeds and notify Slack/JIRA")
+    parser.add_argument("sources", nargs="*", help=f"Sources to run (default: all of {', '.join(SOURCES)})")
+    parser.add_argument("--workers", type=int, default=MAX_FETCH_WORKERS, help="Maximum concurrent feed fetches")
+    parser.add_argument("--stream", action="store_true", default=STREAM_PARSE, help="Parse feeds incrementally and stop matching at entries seen last run")
+    parser.add_argument("--no-snapshots", dest="snapshots", action="store_false", help="Do not keep raw feed snapshots")
+    parser.add_argument("--refilter", action="store_true", default=REFILTER, help="Ignore saved validators and body hashes and match every entry again, e.g. after editing keywords.py (turns off --stream)")
+    args = parser.parse_args(source_names)
+    if args.refilter:
+        # Streaming would stop matching at the entries seen last run
+        args.stream = False
+    unknown = [name for name in args.sources if name not in SOURCES]
+    if unknown:
+        parser.error(f"unknown source(s): {', '.join(unknown)}")
+
+    sources = [SOURCES[name] for name in (args.sources or SOURCES)]
+    start_time = time.time()
+    snapshots = SnapshotStore() if args.snapshots else None
+    run = new_run()
+
+    parsed_feeds = fetch_all(sources, args.workers, args.stream, snapshots, args.refilter)
+    print(f"⚡ Fetched {len(parsed_feeds)}/{len(sources)} feeds in {time.time() - start_time:.1f}s")
+    for source in sources:
+        run["sources"][source["name"]] = snapshot_record(source, parsed_feeds.get(source["name"]))
+
+    seen_store = SeenStore()
+    print(f"📁 Seen entry store: {seen_store.path} ({seen_store.count()} entries)")
+    archive = FeedArchive()
+    dedup_index = DedupIndex()
+    entry_index = EntryIndex()
+
+    new_items = []
+    processed = []
+    still_listed = []
+    not_modified = 0
+    for source in sources:
+        parsed = parsed_feeds.get(source["name"])
+        if parsed is None:
+            continue
+        if rss_common.is_not_modified(parsed):
+            not_modified += 1
+            recent_links = rss_common.load_feed_state(source).get("recent_links")
+            still_listed.extend(recent_links or [])
+            if parsed.get("unchanged"):
+                # Same body under new validators: keep them so the next fetch can be a 304
+                rss_common.save_feed_state(source, parsed, recent_links)
+            continue
+        source_items, links = run_source(source, parsed, seen_store, archive, entry_index, args.stream)
+        new_items.extend(source_items)
+        still_listed.extend(links)
+        processed.append((source, parsed, links))
+
+    # Notify on every source's new entries together so tickets can be created in bulk
+    total_new = len(new_items)
+    if new_items:
+        rss_common.process_and_notify(new_items, seen_store, dedup_index)
+
+    # Validators and recent links are only saved once a source's entries have been notified and recorded
+    for source, parsed, links in processed:
+        rss_common.save_feed_state(source, parsed, links)
+    archive.close()
+
+    # Entries still listed upstream stay in the store however long ago they were first alerted
+    seen_store.touch(still_listed)
+    pruned = seen_store.prune()
+    if pruned:
+        print(f"🧹 Pruned {pruned} seen entries not listed upstream for {seen_store.max_age_days} days")
+    seen_store.close()
+    pruned = dedup_index.prune()
+    if pruned:
+        print(f"🧹 Pruned {pruned} dedup stories older than {dedup_index.window_days} days")
+    dedup_index.close()
+    pruned = entry_index.prune()
+    if pruned:
+        print(f"🧹 Pruned {pruned} indexed entries older than {entry_index.max_age_days} days")
+    entry_index.close()
+    if snapshots is not None:
+        snapshots.write_manifest(run)
+        pruned_runs, pruned_objects = snapshots.prune()
+        if pruned_runs or pruned_objects:
+            print(f"🧹 Pruned {pruned_runs} snapshot runs and {pruned_objects} snapshots older than {snapshots.max_age_days} days")
+
+    rss_common.ack_watcher.wait()
+    print(f"🏁 Processed {len(parsed_feeds)} feed{'s' if len(parsed_feeds) != 1 else ''} with {total_new} new alert{'s' if total_new != 1 else ''} in {time.time() - start_time:.1f}s")
+    print(f"   • Skipped {not_modified} unchanged feed{'s' if not_modified != 1 else ''} (304 Not Modified or same content hash)")
+
+if __name__ == "__main__":
+    main()
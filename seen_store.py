@@ -0,0 +1,97 @@
+import json
+import os
+import sqlite3
+import time
+
+SEEN_DB_FILE = os.path.join(os.environ.get("FEED_DATA_DIR") or os.path.dirname(os.path.abspath(__file__)), ".seen_entries.db")
+
+# Seen entries no longer listed upstream for this long are pruned at the end of each run
+SEEN_ENTRIES_MAX_AGE_DAYS = int(os.environ.get("SEEN_ENTRIES_MAX_AGE_DAYS", "180"))
+
+def entry_key(entry):
+    """Dedup key for an entry: its link, falling back to the GUID"""
+    return getattr(entry, 'link', None) or getattr(entry, 'id', None)
+
+class SeenStore:
+    """SQLite-backed record of entries that have already been notified.
+
+    Lookups hit the primary key index, inserts only touch new rows and
+    prune() drops anything last seen upstream longer ago than the configured
+    age, so startup cost and file size stay flat over time.
+    """
+
+    def __init__(self, path=SEEN_DB_FILE, max_age_days=SEEN_ENTRIES_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age_days = max_age_days
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_entries (
+                entry_key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                ticket_key TEXT,
+                last_seen REAL NOT NULL DEFAULT 0
+            )
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(seen_entries)")}
+        if "last_seen" not in columns:
+            # Stores created before last_seen was tracked: start every row from its first-seen time
+            self.conn.execute("ALTER TABLE seen_entries ADD COLUMN last_seen REAL NOT NULL DEFAULT 0")
+            self.conn.execute("UPDATE seen_entries SET last_seen = first_seen")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_entries_first_seen ON seen_entries (first_seen)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_entries_last_seen ON seen_entries (last_seen)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_entries_source ON seen_entries (source)")
+        self.conn.commit()
+
+    def __contains__(self, key):
+        row = self.conn.execute("SELECT 1 FROM seen_entries WHERE entry_key = ?", (key,)).fetchone()
+        return row is not None
+
+    def add(self, key, source, ticket_key=None):
+        """Record a newly notified entry, leaving existing rows untouched"""
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR IGNORE INTO seen_entries (entry_key, source, first_seen, ticket_key, last_seen) VALUES (?, ?, ?, ?, ?)",
+            (key, source, now, ticket_key, now),
+        )
+        self.conn.commit()
+
+    def touch(self, keys):
+        """Mark entries still listed upstream as seen now, in one transaction, returning how many were stored"""
+        now = time.time()
+        cursor = self.conn.executemany(
+            "UPDATE seen_entries SET last_seen = ? WHERE entry_key = ?",
+            [(now, key) for key in set(keys) if key],
+        )
+        self.conn.commit()
+        return cursor.rowcount
+
+    def count(self, source=None):
+        if source:
+            return self.conn.execute("SELECT COUNT(*) FROM seen_entries WHERE source = ?", (source,)).fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM seen_entries").fetchone()[0]
+
+    def import_legacy_cache(self, source, cache_file):
+        """One-time import of a source's old .seen_entries_*.json link list"""
+        if not cache_file or not os.path.exists(cache_file) or self.count(source):
+            return 0
+        with open(cache_file, "r") as f:
+            links = json.load(f)
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO seen_entries (entry_key, source, first_seen, last_seen) VALUES (?, ?, ?, ?)",
+            [(link, source, now, now) for link in links],
+        )
+        self.conn.commit()
+        return len(links)
+
+    def prune(self, max_age_days=None):
+        """Delete entries last seen more than max_age_days ago, returning how many were removed"""
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        cutoff = time.time() - max_age_days * 86400
+        cursor = self.conn.execute("DELETE FROM seen_entries WHERE last_seen < ?", (cutoff,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,86 @@
+import calendar
+import heapq
+import itertools
+
+# Points per distinct keyword hit in each category, counting at most MAX_HITS_PER_CATEGORY hits
+CATEGORY_WEIGHTS = {"products": 3.0, "threats": 2.0, "others": 1.0}
+MAX_HITS_PER_CATEGORY = 3
+
+# Points for mentioning any CVE, for a CVE in CISA's KEV catalog, and for known ransomware use
+CVE_WEIGHT = 2.0
+KEV_WEIGHT = 5.0
+RANSOMWARE_WEIGHT = 2.0
+
+# The highest CVSS base score mentioned adds this fraction of itself
+CVSS_FACTOR = 0.5
+
+# Minimum score for each JIRA priority, highest first
+PRIORITY_THRESHOLDS = (
+    (16.0, "Highest"),
+    (11.0, "High"),
+    (5.0, "Medium"),
+    (0.0, "Low"),
+)
+
+def severity_score(source, match):
+    """Score an alert from its keyword hits, CVE details and source"""
+    score = sum(
+        weight * min(len(match.get(category, [])), MAX_HITS_PER_CATEGORY)
+        for category, weight in CATEGORY_WEIGHTS.items()
+    )
+    cves = match.get("cves", [])
+    if cves:
+        score += CVE_WEIGHT
+        details = [d for d in (match.get("cve_details", {}).get(cve) for cve in cves) if d]
+        scores = [d["cvss"] for d in details if d["cvss"] is not None]
+        if scores:
+            score += CVSS_FACTOR * max(scores)
+        if any(d["kev"] for d in details):
+            score += KEV_WEIGHT
+        if any(d["ransomware"] == "Known" for d in details):
+            score += RANSOMWARE_WEIGHT
+    return score + source.get("severity_weight", 0)
+
+def priority_name(score):
+    """JIRA priority name for a severity score"""
+    for threshold, name in PRIORITY_THRESHOLDS:
+        if score >= threshold:
+            return name
+    return PRIORITY_THRESHOLDS[-1][1]
+
+def score_alert(source, match):
+    """Record the severity score and JIRA priority on a match"""
+    match["score"] = severity_score(source, match)
+    match["priority"] = priority_name(match["score"])
+    return match
+
+class NotificationQueue:
+    """Priority queue of (source, entry, match) alerts, highest score first.
+
+    Ties go to the older pubDate, then to insertion order, so equally severe
+    alerts still go out oldest first.
+    """
+
+    def __init__(self, items=()):
+        self._heap = []
+        self._counter = itertools.count()
+        for item in items:
+            self.push(item)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, item, *extra):
+        source, entry, match = item
+        published = getattr(entry, 'published_parsed', None)
+        published = calendar.timegm(published) if published else float("inf")
+        heapq.heappush(self._heap, (-match["score"], published, next(self._counter), item, extra))
+
+    def pop(self):
+        """Remove and return the most severe (item, *extra)"""
+        *_, item, extra = heapq.heappop(self._heap)
+        return (item, *extra)
+
+    def pop_batch(self, size):
+        """Remove and return up to size items, most severe first"""
+        return [self.pop() for _ in range(min(size, len(self._heap)))]
@@ -0,0 +1,103 @@
+import glob
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+
+SNAPSHOT_DIR = os.path.join(os.environ.get("FEED_DATA_DIR") or os.path.dirname(os.path.abspath(__file__)), ".snapshots")
+
+# Run manifests older than this are deleted, along with snapshots no remaining run refers to
+SNAPSHOT_MAX_AGE_DAYS = int(os.environ.get("SNAPSHOT_MAX_AGE_DAYS", "30"))
+
+def new_run():
+    """Empty manifest for a run starting now"""
+    now = time.time()
+    return {
+        "run_id": time.strftime("%Y%m%dT%H%M%S", time.gmtime(now)) + f".{int(now * 1000) % 1000:03d}Z-{os.getpid()}",
+        "started": now,
+        "sources": {},
+    }
+
+class SnapshotStore:
+    """Content-addressed store of raw feed bodies plus one manifest per run.
+
+    Bodies are gzipped under objects/<sha256[:2]>/<sha256>.xml.gz, so a feed
+    that comes back byte-for-byte identical costs no extra space. Each run
+    writes runs/<run_id>.json recording what every source returned.
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR, max_age_days=SNAPSHOT_MAX_AGE_DAYS):
+        self.root = root
+        self.max_age_days = max_age_days
+        self.objects_dir = os.path.join(root, "objects")
+        self.runs_dir = os.path.join(root, "runs")
+
+    def object_path(self, sha256):
+        return os.path.join(self.objects_dir, sha256[:2], f"{sha256}.xml.gz")
+
+    def has(self, sha256):
+        return os.path.exists(self.object_path(sha256))
+
+    def put(self, body, sha256):
+        """Store a feed body (file object) under its hash, returning False if it was already stored"""
+        path = self.object_path(sha256)
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        body.seek(0)
+        with gzip.open(tmp_path, "wb") as f:
+            shutil.copyfileobj(body, f)
+        os.replace(tmp_path, path)
+        return True
+
+    def open(self, sha256):
+        """Open a stored body for reading (decompressed)"""
+        return gzip.open(self.object_path(sha256), "rb")
+
+    def write_manifest(self, run):
+        os.makedirs(self.runs_dir, exist_ok=True)
+        run["finished"] = time.time()
+        with open(os.path.join(self.runs_dir, f"{run['run_id']}.json"), "w") as f:
+            json.dump(run, f, indent=2)
+
+    def manifests(self):
+        """Every run manifest, oldest first"""
+        runs = []
+        for path in sorted(glob.glob(os.path.join(self.runs_dir, "*.json"))):
+            with open(path, "r") as f:
+                runs.append(json.load(f))
+        return runs
+
+    def snapshots(self):
+        """[(source, sha256)] for every distinct stored body named in a manifest, oldest run first"""
+        seen = set()
+        result = []
+        for run in self.manifests():
+            for name, record in run["sources"].items():
+                sha256 = record.get("sha256")
+                if sha256 and (name, sha256) not in seen and self.has(sha256):
+                    seen.add((name, sha256))
+                    result.append((name, sha256))
+        return result
+
+    def prune(self, max_age_days=None):
+        """Delete old run manifests and unreferenced bodies, returning (runs, bodies) removed"""
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        cutoff = time.time() - max_age_days * 86400
+        removed_runs = 0
+        referenced = set()
+        for run in self.manifests():
+            if run["started"] < cutoff:
+                os.remove(os.path.join(self.runs_dir, f"{run['run_id']}.json"))
+                removed_runs += 1
+            else:
+                referenced.update(record.get("sha256") for record in run["sources"].values())
+        removed_objects = 0
+        for path in glob.glob(os.path.join(self.objects_dir, "*", "*.xml.gz")):
+            if os.path.basename(path)[:-len(".xml.gz")] not in referenced:
+                os.remove(path)
+                removed_objects += 1
+        return removed_runs, removed_objects
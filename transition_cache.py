@@ -0,0 +1,58 @@
+import json
+import os
+import threading
+import time
+
+TRANSITION_CACHE_FILE = os.path.join(os.environ.get("FEED_DATA_DIR") or os.path.dirname(os.path.abspath(__file__)), ".jira_transitions.json")
+
+# Resolved transition IDs are re-resolved after this long even if JIRA keeps accepting them
+TRANSITION_CACHE_TTL_HOURS = float(os.environ.get("TRANSITION_CACHE_TTL_HOURS", "168"))
+
+# Issue type of every ticket the filter scripts create
+DEFAULT_ISSUE_TYPE = "Sub-task"
+
+class TransitionCache:
+    """Transition IDs resolved per JIRA project and issue type, kept in memory and on disk.
+
+    Every Sub-task under the epic shares one workflow, so the "In Progress"
+    transition only has to be looked up once. Callers invalidate() an entry
+    when JIRA rejects the cached ID and resolve it again.
+    """
+
+    def __init__(self, path=TRANSITION_CACHE_FILE, ttl_hours=TRANSITION_CACHE_TTL_HOURS):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable transition cache {path}: {e}")
+
+    @staticmethod
+    def key(ticket_key, transition_name, issue_type=DEFAULT_ISSUE_TYPE):
+        project = ticket_key.rsplit("-", 1)[0]
+        return f"{project}/{issue_type}/{transition_name.lower()}"
+
+    def get(self, key):
+        with self._lock:
+            record = self._data.get(key)
+        if not record or time.time() - record["cached_at"] > self.ttl:
+            return None
+        return record["id"]
+
+    def put(self, key, transition_id):
+        with self._lock:
+            self._data[key] = {"id": transition_id, "cached_at": time.time()}
+            self._save()
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._save()
+
+    def _save(self):
+        with open(self.path, "w") as f:
+            json.dump(self._data, f)
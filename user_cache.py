@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+import time
+
+USER_CACHE_FILE = os.path.join(os.environ.get("FEED_DATA_DIR") or os.path.dirname(os.path.abspath(__file__)), ".user_cache.json")
+
+# How long resolved users are trusted, and how long a "no JIRA account" answer is remembered
+USER_CACHE_TTL_HOURS = float(os.environ.get("USER_CACHE_TTL_HOURS", "168"))
+USER_CACHE_NEGATIVE_TTL_HOURS = float(os.environ.get("USER_CACHE_NEGATIVE_TTL_HOURS", "24"))
+
+class UserCache:
+    """On-disk TTL cache mapping Slack user ID -> name/email -> JIRA accountId.
+
+    Users with no JIRA match are cached too (for a shorter time) so they are
+    not searched again on every acknowledgment. Failed lookups are never
+    cached.
+    """
+
+    def __init__(self, path=USER_CACHE_FILE, ttl_hours=USER_CACHE_TTL_HOURS, negative_ttl_hours=USER_CACHE_NEGATIVE_TTL_HOURS):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.negative_ttl = negative_ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._data = {"slack_users": {}, "jira_accounts": {}}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self._data.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable user cache {path}: {e}")
+
+    def _get(self, table, key):
+        with self._lock:
+            record = self._data[table].get(key)
+        if not record:
+            return None
+        ttl = self.ttl if record.get("found", True) else self.negative_ttl
+        if time.time() - record["cached_at"] > ttl:
+            return None
+        return record
+
+    def _put(self, table, key, record):
+        record["cached_at"] = time.time()
+        with self._lock:
+            self._data[table][key] = record
+            with open(self.path, "w") as f:
+                json.dump(self._data, f)
+
+    def slack_user(self, user_id, fetch_user_info):
+        """Return {"name", "email"} for a Slack user, calling fetch_user_info on a miss"""
+        record = self._get("slack_users", user_id)
+        if record:
+            return {"name": record["name"], "email": record["email"]}
+        user_info = fetch_user_info(user_id)
+        user = {
+            "name": user_info.get("name", "unknown user"),
+            "email": user_info.get("profile", {}).get("email", None),
+        }
+        if user_info:
+            self._put("slack_users", user_id, dict(user))
+        return user
+
+    def jira_account_id(self, email, search_account_id):
+        """Return the JIRA accountId for an email, calling search_account_id on a miss"""
+        record = self._get("jira_accounts", email)
+        if record:
+            return record["account_id"]
+        try:
+            account_id = search_account_id(email)
+        except Exception as e:
+            print(f"❌ Error looking up JIRA account for {email}: {str(e)}")
+            return None
+        self._put("jira_accounts", email, {"account_id": account_id, "found": account_id is not None})
+        return account_id